@@ -1,32 +1,93 @@
 import os
+import sys
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 
+# Run as archive/<script>.py, so put the repo root on the path for utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.output import ConsoleBuffer
+from utils.walk import walk_entries
+
 console = Console()
 
 PURGE_EXTENSIONS = [".jp2", ".jxl"]
+DEFAULT_WORKERS = 8
+
+def _unlink_batch(dirpath, names):
+    """Unlink names relative to a single descriptor on their parent directory.
+
+    Returns a list of (name, error) pairs, with error set to None on success.
+    """
+    results = []
+    if os.unlink not in os.supports_dir_fd:
+        for name in names:
+            try:
+                os.unlink(os.path.join(dirpath, name))
+                results.append((name, None))
+            except OSError as e:
+                results.append((name, e))
+        return results
 
-def purge_images(root, extensions, dry_run=False, verbose=False):
+    try:
+        dir_fd = os.open(dirpath, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError as e:
+        return [(name, e) for name in names]
+    try:
+        for name in names:
+            try:
+                os.unlink(name, dir_fd=dir_fd)
+                results.append((name, None))
+            except OSError as e:
+                results.append((name, e))
+    finally:
+        os.close(dir_fd)
+    return results
+
+def purge_images(root, extensions, dry_run=False, verbose=False, workers=DEFAULT_WORKERS):
     total = 0
     deleted = 0
     errors = 0
+    ext_tuple = tuple(ext.lower() for ext in extensions)
+    # Per-file lines are batched into one console.print per flush
+    output = ConsoleBuffer(console)
+
+    def report(dirpath, results):
+        nonlocal deleted, errors
+        for f, error in results:
+            if error is None:
+                if verbose:
+                    output.add(f"[green]Deleted:[/green] {os.path.join(dirpath, f)}")
+                deleted += 1
+            else:
+                output.flush()
+                console.print(f"[red]Error deleting {os.path.join(dirpath, f)}: {error}[/red]")
+                errors += 1
 
-    for dirpath, _, filenames in os.walk(root):
-        for f in filenames:
-            if any(f.lower().endswith(ext) for ext in extensions):
-                total += 1
-                full_path = os.path.join(dirpath, f)
-                if dry_run:
-                    console.print(f"[yellow]Would delete:[/yellow] {full_path}")
-                    continue
-                try:
-                    os.remove(full_path)
-                    if verbose:
-                        console.print(f"[green]Deleted:[/green] {full_path}")
-                    deleted += 1
-                except Exception as e:
-                    console.print(f"[red]Error deleting {full_path}: {e}[/red]")
-                    errors += 1
+    # Unlinks release the GIL, so directory batches are deleted on a pool while
+    # the walk continues. Results are reported from this thread only, and the
+    # number of batches in flight is bounded to keep memory flat.
+    pending = deque()
+    max_pending = max(1, workers) * 4
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for dirpath, files in walk_entries(root):
+            matches = [entry.name for entry in files if entry.name.lower().endswith(ext_tuple)]
+            if not matches:
+                continue
+            total += len(matches)
+            if dry_run:
+                for f in matches:
+                    output.add(f"[yellow]Would delete:[/yellow] {os.path.join(dirpath, f)}")
+                continue
+            pending.append((dirpath, executor.submit(_unlink_batch, dirpath, matches)))
+            while len(pending) >= max_pending:
+                dirpath, future = pending.popleft()
+                report(dirpath, future.result())
+        while pending:
+            dirpath, future = pending.popleft()
+            report(dirpath, future.result())
+    output.flush()
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Files matched: {total}")
@@ -39,5 +100,6 @@ if __name__ == "__main__":
     parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without deleting files")
     parser.add_argument("--verbose", action="store_true", help="Print each deletion")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Parallel deletion threads (default: {DEFAULT_WORKERS})")
     args = parser.parse_args()
-    purge_images(args.directory, PURGE_EXTENSIONS, args.dry_run, args.verbose)
\ No newline at end of file
+    purge_images(args.directory, PURGE_EXTENSIONS, args.dry_run, args.verbose, args.workers)
\ No newline at end of file
@@ -1,30 +1,56 @@
 import os
 import argparse
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 
 console = Console()
 
-def purge_lyrics_folders(root, dry_run=False, verbose=False):
-    scanned = 0
+# Deletes are syscall-bound and release the GIL, so keep several in flight
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Folder names to purge, compared casefolded
+PURGE_NAMES = frozenset({"lyrics"})
+
+def find_lyrics_folders(root):
+    """Collect every 'Lyrics' folder in one walk, without descending into the ones it finds."""
+    found = []
+    for dirpath, dirnames, _ in os.walk(root):
+        kept = []
+        for dirname in dirnames:
+            if dirname.casefold() in PURGE_NAMES:
+                found.append(os.path.join(dirpath, dirname))
+            else:
+                kept.append(dirname)
+        # Anything nested inside a Lyrics folder goes with it
+        dirnames[:] = kept
+    return found
+
+def remove_folder(full_path):
+    """rmtree one folder; returns the error, or None on success. Safe to run in threads."""
+    try:
+        shutil.rmtree(full_path)
+        return None
+    except Exception as e:
+        return e
+
+def purge_lyrics_folders(root, dry_run=False, verbose=False, workers=DEFAULT_WORKERS):
+    folders = find_lyrics_folders(root)
+    scanned = len(folders)
     removed = 0
     errors = 0
 
-    for dirpath, dirnames, _ in os.walk(root, topdown=False):
-        for dirname in dirnames:
-            if dirname.lower() == "lyrics":
-                scanned += 1
-                full_path = os.path.join(dirpath, dirname)
-                if dry_run:
-                    console.print(f"[yellow]Would delete:[/yellow] {full_path}")
-                    continue
-                try:
-                    shutil.rmtree(full_path)
+    if dry_run:
+        for full_path in folders:
+            console.print(f"[yellow]Would delete:[/yellow] {full_path}")
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for full_path, error in zip(folders, executor.map(remove_folder, folders)):
+                if error is None:
                     if verbose:
                         console.print(f"[green]Deleted:[/green] {full_path}")
                     removed += 1
-                except Exception as e:
-                    console.print(f"[red]Error deleting {full_path}: {e}[/red]")
+                else:
+                    console.print(f"[red]Error deleting {full_path}: {error}[/red]")
                     errors += 1
 
     console.print("\n[bold underline]Summary[/bold underline]")
@@ -38,5 +64,6 @@ if __name__ == "__main__":
     parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without deleting folders")
     parser.add_argument("--verbose", action="store_true", help="Print each deletion")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Folders deleted in parallel (default: {DEFAULT_WORKERS})")
     args = parser.parse_args()
-    purge_lyrics_folders(args.directory, args.dry_run, args.verbose)
\ No newline at end of file
+    purge_lyrics_folders(args.directory, args.dry_run, args.verbose, args.workers)
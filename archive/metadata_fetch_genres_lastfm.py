@@ -5,13 +5,26 @@ mp3_genres_from_lastfm.py - Replaces the Genre field of MP3 files with the top t
 
 import os
 import re
+import sys
 import argparse
+import json
+import sqlite3
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-from mutagen.id3 import ID3, ID3NoHeaderError
+from typing import List, Tuple
+from mutagen.id3 import ID3, ID3NoHeaderError, TPE1, TP1
 from rich.console import Console
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Run as archive/<script>.py, so put the repo root on the path for utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.cache import CACHE_DIR
+from utils.output import ConsoleBuffer
 
 console = Console()
 
@@ -83,7 +96,7 @@ COMPOUND_EXPANSIONS = {
     "hardcore punk": ["Hardcore Punk"],
 }
 
-COMMON_GENRE_WORDS = {
+COMMON_GENRE_WORDS = frozenset({
     "metal", "rock", "punk", "hardcore", "core", "thrash", "death",
     "black", "doom", "folk", "progressive", "power", "symphonic",
     "alternative", "classic", "heavy", "beatdown", "crossover",
@@ -91,38 +104,81 @@ COMMON_GENRE_WORDS = {
     "industrial", "math", "horror", "grindcore", "deathcore", "mathcore",
     "post", "new", "nu", "glam", "technical", "brutal", "slamming",
     "viking", "war", "atmospheric", "avantgarde", "blackened"
-}
+})
 
 BLOCKED_TAGS = {"seen live"}
 
+# Single lookup table for expand_genre. Single-term keys never contain a slash
+# or a space, so checking them up front matches the original branch order.
+_EXPANSION_LOOKUP = {k: (v,) for k, v in GENRE_EXPANSIONS.items()}
+_EXPANSION_LOOKUP.update({k: tuple(v) for k, v in COMPOUND_EXPANSIONS.items()})
+_EXPANSION_LOOKUP.update({k: tuple(v) for k, v in SLASH_EXPANSIONS.items()})
+
+# Genre pairs that get a combined slash genre prepended unless one is already present
+AUTO_COMBINATIONS = [
+    (("death metal", "doom metal"), ("death/doom", "doom/death"), "Death/Doom"),
+    (("thrash metal", "death metal"), ("death/thrash", "thrash/death"), "Death/Thrash"),
+    (("black metal", "thrash metal"), ("black/thrash", "thrash/black"), "Black/Thrash"),
+    (("black metal", "death metal"), ("black/death", "death/black"), "Black/Death"),
+]
+
+LASTFM_API_URL = "https://ws.audioscrobbler.com/2.0/"
+
+# Last.fm allows roughly 5 requests per second per API key
+LASTFM_MAX_WORKERS = 5
+LASTFM_MIN_INTERVAL = 0.2
+
+# Tag reads/writes are disk-bound and release the GIL
+TAG_IO_WORKERS = 16
+
+# Only the artist frame (v2.3/2.4 and its v2.2 alias) is parsed when reading
+# artists; everything else, notably large APIC cover frames, stays raw bytes.
+ARTIST_ONLY_FRAMES = {"TPE1": TPE1, "TP1": TP1}
+
+CACHE_PATH = Path(CACHE_DIR) / "lastfm.sqlite"
+DEFAULT_REFRESH_DAYS = 30
+
+_MIXED_CASE_RE = re.compile(r"\b([a-z])([a-z0-9'&]*)\b")
+_SPACE_RE = re.compile(r"\s+")
+_WORD_CHARS_RE = re.compile(r"\w+")
+
 
+@lru_cache(maxsize=2048)
+def _word_re(current_lower: str):
+    """Compiled whole-word matcher for a lowercased single-word genre."""
+    return re.compile(rf"\b{re.escape(current_lower)}\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=8192)
 def to_mixed_case(tag: str) -> str:
     """Capitalize first letter of each word while preserving separators."""
     if not tag:
         return ""
     lower = tag.lower().strip()
     # Capitalize first letter of each word
-    cased = re.sub(r"\b([a-z])([a-z0-9'&]*)\b", lambda m: m.group(1).upper() + m.group(2), lower)
-    return re.sub(r"\s+", " ", cased).strip()
+    cased = _MIXED_CASE_RE.sub(lambda m: m.group(1).upper() + m.group(2), lower)
+    return _SPACE_RE.sub(" ", cased).strip()
+
 
+@lru_cache(maxsize=4096)
+def expand_genre(genre: str) -> Tuple[str, ...]:
+    """Expand a single genre according to the expansion scheme.
 
-def expand_genre(genre: str) -> List[str]:
-    """Expand a single genre according to the expansion scheme."""
+    Results are cached, so the returned tuple is shared between callers.
+    """
     lower = genre.lower().strip()
     expanded = []
     
-    # Check for slash notation first
-    if lower in SLASH_EXPANSIONS:
-        return SLASH_EXPANSIONS[lower]
+    # Check known slash, compound and single-term expansions in one lookup
+    known = _EXPANSION_LOOKUP.get(lower)
+    if known is not None:
+        return known
     
-    # Check for known compound expansions
-    if lower in COMPOUND_EXPANSIONS:
-        return COMPOUND_EXPANSIONS[lower]
-    
-    # Handle slash notation pattern (Genre1/Genre2)
-    slash_match = re.match(r"^(.+?)/(.+)$", lower)
-    if slash_match:
-        part1, part2 = slash_match.groups()
+    # Handle slash notation pattern (Genre1/Genre2): split on the first
+    # slash that has text on both sides
+    slash_pos = lower.find("/", 1)
+    if 0 < slash_pos < len(lower) - 1:
+        part1, part2 = lower[:slash_pos], lower[slash_pos + 1:]
         genre1 = to_mixed_case(part1.strip())
         genre2 = to_mixed_case(part2.strip())
         combined = to_mixed_case(f"{part1.strip()}/{part2.strip()}")
@@ -135,7 +191,7 @@ def expand_genre(genre: str) -> List[str]:
         expanded.append(combined)
         expanded.extend(expanded1)
         expanded.extend(expanded2)
-        return unique_case_insensitive(expanded)
+        return tuple(unique_case_insensitive(expanded))
     
     # Handle compound words
     words = lower.split()
@@ -146,69 +202,84 @@ def expand_genre(genre: str) -> List[str]:
             expanded_second = GENRE_EXPANSIONS.get(last_word, to_mixed_case(last_word))
             expanded.append(first_part)
             expanded.append(expanded_second)
-            return unique_case_insensitive(expanded)
-    
-    # Check if it's a single genre term that should be expanded
-    if lower in GENRE_EXPANSIONS:
-        return [GENRE_EXPANSIONS[lower]]
+            return tuple(unique_case_insensitive(expanded))
     
     # Default: return the genre as-is (properly cased)
-    return [to_mixed_case(genre)]
+    return (to_mixed_case(genre),)
 
 
-def unique_case_insensitive(arr: List[str]) -> List[str]:
-    """Remove duplicates case-insensitively while preserving order."""
+def unique_folded(arr: List[str]) -> List[Tuple[str, str]]:
+    """Remove duplicates case-insensitively, returning (original, casefolded) pairs in order."""
     seen = set()
     out = []
     for v in arr:
-        key = v.lower()
+        key = v.casefold()
         if key not in seen:
             seen.add(key)
-            out.append(v)
+            out.append((v, key))
     return out
 
 
-def remove_redundant_genres(genres: List[str]) -> List[str]:
-    """Remove redundant genres (e.g., 'Rock' when 'Hard Rock' is present)."""
+def unique_case_insensitive(arr: List[str]) -> List[str]:
+    """Remove duplicates case-insensitively while preserving order."""
+    return [v for v, _ in unique_folded(arr)]
+
+
+def _contains_tokens(haystack: tuple, needle: tuple) -> bool:
+    """Check whether needle appears as a contiguous run inside haystack."""
+    n = len(needle)
+    return any(haystack[k:k + n] == needle for k in range(len(haystack) - n + 1))
+
+
+def remove_redundant_genres(genres: List[str], folded: List[str] = None) -> List[str]:
+    """Remove redundant genres (e.g., 'Rock' when 'Hard Rock' is present).
+
+    ``folded`` may carry the already casefolded genres to avoid folding them again.
+    """
     if len(genres) <= 1:
         return genres
     
     filtered = []
-    lower_genres = [g.lower() for g in genres]
+    lower_genres = folded if folded is not None else [g.casefold() for g in genres]
+    tokens = [tuple(g.split()) for g in lower_genres]
+    
+    # Slash notation genres never make another genre redundant, so only the
+    # rest are candidates. Each carries its whitespace tokens (for phrase
+    # matches) and its set of \w+ words (for single-word matches).
+    candidates = [
+        (j, len(genres[j]), tokens[j], set(_WORD_CHARS_RE.findall(lower_genres[j])))
+        for j in range(len(genres))
+        if "/" not in genres[j]
+    ]
     
     for i, current in enumerate(genres):
         current_lower = lower_genres[i]
-        is_redundant = False
         
         # Don't remove slash notation genres
         if "/" in current:
             filtered.append(current)
             continue
         
-        # Check if this genre is contained in any other genre
-        for j, other in enumerate(genres):
-            if i == j:
-                continue
-            
-            other_lower = lower_genres[j]
-            
-            # Skip slash notation when checking
-            if "/" in other:
+        current_len = len(current)
+        current_tokens = tokens[i]
+        multi_word = " " in current_lower
+        plain_word = not multi_word and _WORD_CHARS_RE.fullmatch(current_lower) is not None
+        pattern = None if multi_word or plain_word else _word_re(current_lower)
+        
+        # If a longer genre contains this one as a whole word/phrase, it is redundant
+        is_redundant = False
+        for j, other_len, other_tokens, other_words in candidates:
+            if j == i or other_len <= current_len:
                 continue
-            
-            # If the other genre is longer and contains this genre, this one is redundant
-            if len(other) > len(current):
-                escaped_current = re.escape(current_lower)
-                
-                # For multi-word genres, match as whole phrase
-                if " " in current_lower:
-                    pattern = re.compile(rf"(^|\s){escaped_current}(\s|$)", re.IGNORECASE)
-                else:
-                    pattern = re.compile(rf"\b{escaped_current}\b", re.IGNORECASE)
-                
-                if pattern.search(other_lower):
-                    is_redundant = True
-                    break
+            if multi_word:
+                found = _contains_tokens(other_tokens, current_tokens)
+            elif plain_word:
+                found = current_lower in other_words
+            else:
+                found = pattern.search(lower_genres[j]) is not None
+            if found:
+                is_redundant = True
+                break
         
         if not is_redundant:
             filtered.append(current)
@@ -225,41 +296,60 @@ def expand_genres(genres: List[str]) -> List[str]:
         expanded = expand_genre(genre)
         all_expanded.extend(expanded)
     
-    # Get unique expanded genres
-    unique_expanded = unique_case_insensitive(all_expanded)
-    lower_expanded = [g.lower() for g in unique_expanded]
+    # Get unique expanded genres, casefolded once for every comparison below
+    pairs = unique_folded(all_expanded)
+    lower_set = {key for _, key in pairs}
+    slash_genres = [g for g in lower_set if "/" in g]
     
     # Special handling: automatically combine related genres
-    has_death_metal = "death metal" in lower_expanded
-    has_doom_metal = "doom metal" in lower_expanded
-    has_death_doom_slash = any("death/doom" in g or "doom/death" in g for g in lower_expanded)
-    if has_death_metal and has_doom_metal and not has_death_doom_slash:
-        unique_expanded.insert(0, "Death/Doom")
-    
-    has_thrash_metal = "thrash metal" in lower_expanded
-    has_death_metal2 = "death metal" in lower_expanded
-    has_death_thrash_slash = any("death/thrash" in g or "thrash/death" in g for g in lower_expanded)
-    if has_thrash_metal and has_death_metal2 and not has_death_thrash_slash:
-        unique_expanded.insert(0, "Death/Thrash")
-    
-    has_black_metal = "black metal" in lower_expanded
-    has_thrash_metal2 = "thrash metal" in lower_expanded
-    has_black_thrash_slash = any("black/thrash" in g or "thrash/black" in g for g in lower_expanded)
-    if has_black_metal and has_thrash_metal2 and not has_black_thrash_slash:
-        unique_expanded.insert(0, "Black/Thrash")
+    for (first, second), slash_forms, combined in AUTO_COMBINATIONS:
+        if first in lower_set and second in lower_set:
+            if not any(form in g for g in slash_genres for form in slash_forms):
+                pairs.insert(0, (combined, combined.casefold()))
     
-    has_black_metal2 = "black metal" in lower_expanded
-    has_death_metal3 = "death metal" in lower_expanded
-    has_black_death_slash = any("black/death" in g or "death/black" in g for g in lower_expanded)
-    if has_black_metal2 and has_death_metal3 and not has_black_death_slash:
-        unique_expanded.insert(0, "Black/Death")
-    
-    return remove_redundant_genres(unique_expanded)
+    return remove_redundant_genres([g for g, _ in pairs], [key for _, key in pairs])
+
+
+class RateLimiter:
+    """Space out calls across threads so at most one starts per interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiter = RateLimiter(LASTFM_MIN_INTERVAL)
+
+
+def _build_session() -> requests.Session:
+    """Shared keep-alive session; rate limits (429) and 5xx are retried with backoff."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.6,
+        status_forcelist=[429, *range(500, 600)],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LASTFM_MAX_WORKERS, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _build_session()
 
 
 def fetch_top_tags(artist: str, api_key: str, max_tags: int = 2) -> List[str]:
-    """Fetch top tags for artist from Last.fm API with retry logic."""
-    url = "https://ws.audioscrobbler.com/2.0/"
+    """Fetch top tags for artist from Last.fm API (retries are handled by the session)."""
     params = {
         "method": "artist.gettoptags",
         "artist": artist,
@@ -267,65 +357,88 @@ def fetch_top_tags(artist: str, api_key: str, max_tags: int = 2) -> List[str]:
         "format": "json"
     }
     
-    attempts = 0
-    delay = 0.6  # seconds
-    
-    while attempts < 4:
-        try:
-            time.sleep(0.3)  # Rate limiting
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                tags = data.get("toptags", {}).get("tag", [])
-                
-                if not tags:
-                    return []
-                
-                # Normalize to list
-                if not isinstance(tags, list):
-                    tags = [tags]
-                
-                # Filter out blocked tags and sort by count
-                cleaned = []
-                for t in tags:
-                    name = t.get("name", "")
-                    if name and name.lower() not in BLOCKED_TAGS:
-                        cleaned.append({
-                            "name": name,
-                            "count": int(t.get("count", "0") or "0")
-                        })
-                
-                # Sort by count descending
-                cleaned.sort(key=lambda x: x["count"], reverse=True)
-                
-                # Take top max_tags and convert to mixed case
-                return [to_mixed_case(t["name"]) for t in cleaned[:max_tags]]
-            
-            elif response.status_code == 429 or (500 <= response.status_code < 600):
-                # Rate limited or server error - retry
-                attempts += 1
-                time.sleep(delay)
-                delay *= 2
-                continue
-            else:
-                # Other errors - don't retry
-                return []
-                
-        except Exception as e:
-            console.print(f"[yellow]Error fetching tags for {artist}: {e}[/yellow]")
-            attempts += 1
-            if attempts < 4:
-                time.sleep(delay)
-                delay *= 2
+    try:
+        _rate_limiter.wait()
+        response = _session.get(LASTFM_API_URL, params=params, timeout=10)
+        
+        if response.status_code != 200:
+            # Still failing after retries, or an error that isn't worth retrying
+            return []
+        
+        data = response.json()
+        tags = data.get("toptags", {}).get("tag", [])
+        
+        if not tags:
+            return []
+        
+        # Normalize to list
+        if not isinstance(tags, list):
+            tags = [tags]
+        
+        # Filter out blocked tags and sort by count
+        cleaned = []
+        for t in tags:
+            name = t.get("name", "")
+            if name and name.lower() not in BLOCKED_TAGS:
+                cleaned.append({
+                    "name": name,
+                    "count": int(t.get("count", "0") or "0")
+                })
+        
+        # Sort by count descending
+        cleaned.sort(key=lambda x: x["count"], reverse=True)
+        
+        # Take top max_tags and convert to mixed case
+        return [to_mixed_case(t["name"]) for t in cleaned[:max_tags]]
     
-    return []
+    except Exception as e:
+        console.print(f"[yellow]Error fetching tags for {artist}: {e}[/yellow]")
+        return []
+
+
+def open_tag_cache(path: Path = CACHE_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the on-disk artist tag cache."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tags (artist TEXT PRIMARY KEY, tags TEXT, fetched_at INTEGER)"
+    )
+    return conn
+
+
+def load_cached_tags(conn: sqlite3.Connection, artists: List[str], refresh_after_days: int) -> dict:
+    """Return {casefolded artist: tags} for cached artists newer than the refresh window."""
+    cutoff = int(time.time()) - refresh_after_days * 86400
+    keys = [a.casefold() for a in artists]
+    cached = {}
+    # Stay well under SQLite's host parameter limit
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT artist, tags FROM tags WHERE fetched_at >= ? AND artist IN ({placeholders})",
+            [cutoff, *chunk],
+        )
+        for artist, tags in rows:
+            cached[artist] = json.loads(tags)
+    return cached
+
+
+def store_cached_tags(conn: sqlite3.Connection, fetched: dict):
+    """Persist freshly fetched {casefolded artist: tags} entries."""
+    now = int(time.time())
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tags (artist, tags, fetched_at) VALUES (?, ?, ?)",
+            [(artist, json.dumps(tags), now) for artist, tags in fetched.items()],
+        )
 
 
 def get_artist_from_mp3(file_path: str) -> str:
     """Get artist tag from MP3 file."""
     try:
-        tags = ID3(file_path)
+        tags = ID3(file_path, known_frames=ARTIST_ONLY_FRAMES)
         artist_frames = tags.getall("TPE1")  # TPE1 is Artist frame
         if artist_frames:
             return str(artist_frames[0])
@@ -334,6 +447,24 @@ def get_artist_from_mp3(file_path: str) -> str:
     return ""
 
 
+def iter_mp3_files(directory: str):
+    """Yield paths of .mp3 files under directory, walking lazily with os.scandir."""
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_mp3_files(entry.path)
+            elif entry.name.endswith(".mp3") and entry.is_file():
+                yield entry.path
+
+
+def _read_artist(file_path: str):
+    return file_path, get_artist_from_mp3(file_path)
+
+
 def update_genre(file_path: str, genre: str) -> bool:
     """Update genre tag in MP3 file."""
     try:
@@ -355,42 +486,57 @@ def update_genre(file_path: str, genre: str) -> bool:
         return False
 
 
-def scan_directory(directory: str, api_key: str, dry_run: bool = False, verbose: bool = False):
+def scan_directory(directory: str, api_key: str, dry_run: bool = False, verbose: bool = False,
+                   refresh_after_days: int = DEFAULT_REFRESH_DAYS):
     """Scan directory for MP3 files and update genres."""
-    directory_path = Path(directory)
-    mp3_files = list(directory_path.rglob("*.mp3"))
+    # First pass: collect artists. Files are handed to the pool as the walk
+    # finds them, so tag reads overlap with directory traversal.
+    file_count = 0
+    file_infos = []
+    with ThreadPoolExecutor(max_workers=TAG_IO_WORKERS) as executor:
+        for file_path, artist in executor.map(_read_artist, iter_mp3_files(directory)):
+            file_count += 1
+            if artist:
+                file_infos.append({"file": file_path, "artist": artist})
     
-    if not mp3_files:
+    if not file_count:
         console.print(f"[yellow]No MP3 files found in: {directory}[/yellow]")
         return
     
-    console.print(f"[bold]Found {len(mp3_files)} MP3 files[/bold]")
-    
-    # First pass: collect artists
-    file_infos = []
-    for mp3_file in mp3_files:
-        artist = get_artist_from_mp3(str(mp3_file))
-        if artist:
-            file_infos.append({"file": str(mp3_file), "artist": artist})
+    console.print(f"[bold]Found {file_count} MP3 files[/bold]")
     
     # Get unique artists
     unique_artists = unique_case_insensitive([fi["artist"] for fi in file_infos])
     
-    console.print(f"[bold]Fetching tags for {len(unique_artists)} unique artist(s) from Last.fm...[/bold]")
+    # Reuse tags from previous runs; only artists missing from the cache hit Last.fm
+    conn = open_tag_cache()
+    artist_cache = load_cached_tags(conn, unique_artists, refresh_after_days)
+    to_fetch = [a for a in unique_artists if a.casefold() not in artist_cache]
+    
+    console.print(f"[bold]Fetching tags for {len(to_fetch)} of {len(unique_artists)} unique artist(s) from Last.fm...[/bold]")
     
-    # Cache tags per artist
-    artist_cache = {}
-    for artist in unique_artists:
-        tags = fetch_top_tags(artist, api_key, max_tags=2)
-        artist_cache[artist.lower()] = tags
-        if verbose:
-            console.print(f"[cyan]Artist: {artist} -> Tags: {tags}[/cyan]")
+    # Cache tags per artist; requests overlap but stay under the rate limit
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=LASTFM_MAX_WORKERS) as executor:
+        results = executor.map(lambda a: fetch_top_tags(a, api_key, max_tags=2), to_fetch)
+        for artist, tags in zip(to_fetch, results):
+            artist_cache[artist.casefold()] = tags
+            # Empty results may be transient API failures, so don't persist them
+            if tags:
+                fetched[artist.casefold()] = tags
+            if verbose:
+                console.print(f"[cyan]Artist: {artist} -> Tags: {tags}[/cyan]")
+    store_cached_tags(conn, fetched)
+    conn.close()
     
     # Second pass: update files
     updated = 0
     skipped = 0
     missing_artist = 0
     failed = 0
+    pending_writes = []
+    # Per-file lines are batched into one console.print per flush
+    output = ConsoleBuffer(console)
     
     for file_info in file_infos:
         file_path = file_info["file"]
@@ -400,14 +546,14 @@ def scan_directory(directory: str, api_key: str, dry_run: bool = False, verbose:
         if not artist:
             missing_artist += 1
             if verbose:
-                console.print(f"[yellow]Skipped {file_name}: No artist tag[/yellow]")
+                output.add(f"[yellow]Skipped {file_name}: No artist tag[/yellow]")
             continue
         
-        top_tags = artist_cache.get(artist.lower(), [])
+        top_tags = artist_cache.get(artist.casefold(), [])
         if not top_tags:
             skipped += 1
             if verbose:
-                console.print(f"[yellow]Skipped {file_name}: No top tags found for '{artist}'[/yellow]")
+                output.add(f"[yellow]Skipped {file_name}: No top tags found for '{artist}'[/yellow]")
             continue
         
         # Expand genres
@@ -415,19 +561,26 @@ def scan_directory(directory: str, api_key: str, dry_run: bool = False, verbose:
         final_genre = "; ".join(expanded_genres)
         
         if dry_run:
-            console.print(f"[green]Would update {file_name}: Genre -> '{final_genre}'[/green]")
+            output.add(f"[green]Would update {file_name}: Genre -> '{final_genre}'[/green]")
             updated += 1
         else:
-            if update_genre(file_path, final_genre):
+            pending_writes.append((file_path, file_name, final_genre))
+    output.flush()
+    
+    with ThreadPoolExecutor(max_workers=TAG_IO_WORKERS) as executor:
+        results = executor.map(lambda w: update_genre(w[0], w[2]), pending_writes)
+        for (file_path, file_name, final_genre), ok in zip(pending_writes, results):
+            if ok:
                 updated += 1
                 if verbose:
-                    console.print(f"[green]Updated {file_name}: Genre -> '{final_genre}'[/green]")
+                    output.add(f"[green]Updated {file_name}: Genre -> '{final_genre}'[/green]")
             else:
                 failed += 1
+    output.flush()
     
     # Summary
     console.print("\n[bold underline]Summary[/bold underline]")
-    console.print(f"Audio files scanned: {len(mp3_files)}")
+    console.print(f"Audio files scanned: {file_count}")
     console.print(f"Genres updated: {updated}")
     console.print(f"Skipped (no/empty top tags): {skipped}")
     console.print(f"Skipped (no artist tag): {missing_artist}")
@@ -443,6 +596,8 @@ if __name__ == "__main__":
     parser.add_argument("--api-key", help="Last.fm API key (or set LASTFM_API_KEY env var)")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without modifying files")
     parser.add_argument("--verbose", action="store_true", help="Print detailed output")
+    parser.add_argument("--refresh-after", type=int, default=DEFAULT_REFRESH_DAYS, metavar="DAYS",
+                        help=f"Re-fetch cached artist tags older than DAYS (default: {DEFAULT_REFRESH_DAYS})")
     args = parser.parse_args()
     
     # Get API key from arg or env var
@@ -453,5 +608,5 @@ if __name__ == "__main__":
         console.print("[yellow]Get your API key: https://www.last.fm/api/account/create[/yellow]")
         exit(1)
     
-    scan_directory(args.directory, api_key, args.dry_run, args.verbose)
+    scan_directory(args.directory, api_key, args.dry_run, args.verbose, args.refresh_after)
 
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 normalize_multi_artist.py - Normalizes ARTIST and TITLE tags so only the first artist
-remains in ARTIST and additional artists are appended to TITLE as (feat. ...).
+remains in ARTIST and additional artists are appended to TITLE as (feat. ...), or merged
+into an existing (feat. ...) parenthetical.
 """
 
 import os
@@ -14,6 +15,12 @@ from rich.console import Console
 
 console = Console()
 
+_SPLIT_ARTISTS_RE = re.compile(r';\s*|,\s*|\s/\s|\s&\s|\sfeat\.?\s|\sft\.?\s', re.IGNORECASE)
+_FEAT_RE = re.compile(r'\(feat\.?[^)]*\)', re.IGNORECASE)
+# "(feat. A, B & C)" / "(feat A)" with the artist list captured; not "(featuring ...)"
+_FEAT_CAPTURE_RE = re.compile(r'\(feat(?:\.|\b)\s*([^)]*)\)', re.IGNORECASE)
+_FEAT_LIST_SPLIT_RE = re.compile(r'\s*(?:,|&)\s*')
+
 
 def split_artists(raw: str) -> List[str]:
     """Split artist string into individual artists."""
@@ -21,23 +28,18 @@ def split_artists(raw: str) -> List[str]:
         return []
     
     # Split on ";", "," or " / " or " & " or " feat. " / " ft. "
-    tokens = re.split(r';\s*|,\s*|\s/\s|\s&\s|\sfeat\.?\s|\sft\.?\s', raw, flags=re.IGNORECASE)
-    tokens = [t.strip() for t in tokens if t.strip()]
+    tokens = [t for t in map(str.strip, _SPLIT_ARTISTS_RE.split(raw)) if t]
     
     # If no delimiters found, keep as single artist
     if not tokens and raw.strip():
         tokens = [raw.strip()]
     
     # Deduplicate while preserving order (case-insensitive)
-    seen = set()
-    out = []
+    unique = {}
     for t in tokens:
-        key = t.lower()
-        if key not in seen:
-            seen.add(key)
-            out.append(t)
+        unique.setdefault(t.casefold(), t)
     
-    return out
+    return list(unique.values())
 
 
 def format_feat(additional: List[str]) -> str:
@@ -56,14 +58,49 @@ def format_feat(additional: List[str]) -> str:
 
 def title_has_feat(title: str) -> bool:
     """Check if title already has a (feat. ...) tag."""
-    if not title:
+    if not title or "(feat" not in title.lower():
         return False
-    return bool(re.search(r'\(feat\.?[^)]*\)', title, re.IGNORECASE))
+    return bool(_FEAT_RE.search(title))
+
+
+def merge_feat(title: str, to_add: List[str]) -> str:
+    """Add artists to the title's (feat. ...) list, or append a new one."""
+    def upsert(match):
+        existing = [a for a in _FEAT_LIST_SPLIT_RE.split(match.group(1).strip()) if a]
+        known = {a.casefold() for a in existing}
+        return format_feat(existing + [a for a in to_add if a.casefold() not in known])
+
+    merged, count = _FEAT_CAPTURE_RE.subn(upsert, title, count=1)
+    if count:
+        return merged
+    if title_has_feat(title):
+        # Some other feat. style (e.g. "featuring") that we don't rewrite
+        return title
+    return f"{title} {format_feat(to_add)}"
 
 
-def escape_regex(s: str) -> str:
-    """Escape special regex characters."""
-    return re.escape(s)
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def contains_word(text_lower: str, word_lower: str) -> bool:
+    """Substring search with the same boundary rules as re.search(rf"\b{word}\b").
+
+    Both arguments must already be lowercased (or casefolded) the same way.
+    """
+    if not word_lower:
+        return False
+    first_is_word = _is_word_char(word_lower[0])
+    last_is_word = _is_word_char(word_lower[-1])
+    idx = text_lower.find(word_lower)
+    while idx >= 0:
+        end = idx + len(word_lower)
+        before_is_word = idx > 0 and _is_word_char(text_lower[idx - 1])
+        after_is_word = end < len(text_lower) and _is_word_char(text_lower[end])
+        if before_is_word != first_is_word and after_is_word != last_is_word:
+            return True
+        idx = text_lower.find(word_lower, idx + 1)
+    return False
 
 
 def normalize_metadata(file_path: str, dry_run: bool = False) -> dict:
@@ -108,25 +145,17 @@ def normalize_metadata(file_path: str, dry_run: bool = False) -> dict:
         # Primary artist is first
         primary = artists[0]
         
-        # Additional artists (excluding primary, case-insensitive)
-        additional_raw = [
-            a for a in artists[1:]
-            if a.lower() != primary.lower()
-        ]
+        # Additional artists (excluding primary, case-insensitive), folded once each
+        primary_folded = primary.casefold()
+        folded_artists = ((a, a.casefold()) for a in artists[1:])
+        additional_raw = [(a, folded) for a, folded in folded_artists if folded != primary_folded]
         
-        # Avoid duplicating names if already present in title
-        to_add = []
-        for a in additional_raw:
-            # Check if artist name is already in title (word boundary match)
-            pattern = re.compile(rf"\b{escape_regex(a)}\b", re.IGNORECASE)
-            if not pattern.search(before_title):
-                to_add.append(a)
+        # Avoid duplicating names if already present in title (word boundary match)
+        title_folded = before_title.casefold()
+        to_add = [a for a, folded in additional_raw if not contains_word(title_folded, folded)]
         
         # Build new title
-        after_title = before_title
-        if to_add and not title_has_feat(before_title):
-            feat_str = format_feat(to_add)
-            after_title = f"{before_title} {feat_str}"
+        after_title = merge_feat(before_title, to_add) if to_add else before_title
         
         after_artist = primary
         
@@ -0,0 +1,300 @@
+import io
+import os
+import argparse
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from rich.text import Text
+from utils.cache import CACHE_DIR, load_json_cache, save_json_cache
+from utils.output import capture_console
+from utils.walk import WORKERS_PER_VOLUME, default_workers, sorted_walk
+
+console = Console()
+
+# Archive listings keyed on absolute archive path, reused while its mtime and size are unchanged
+LISTING_CACHE_PATH = os.path.join(CACHE_DIR, "archive_listings.json")
+
+# Folders archived concurrently; each compressor is a separate (often multithreaded) process
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
+# Default lossy formats to archive (lowercase, without the leading dot)
+LOSSY_EXTS = frozenset({"mp3", "aac", "ogg", "m4a", "wav"})
+
+# Per-mode naming: archive prefix, existing-archive prefixes to reuse, and output wording
+MODES = {
+    "lossy": {
+        "exts": LOSSY_EXTS,
+        "prefix": "Lossy",
+        "existing": ("MP3.", "Lossy."),
+        "label": "files",
+        "summary": "Lossy files archived",
+        "description": "Archive lossy files (MP3, AAC, OGG, etc.) that duplicate FLACs into various archive formats and optionally delete originals.",
+    },
+    "mp3": {
+        "exts": frozenset({"mp3"}),
+        "prefix": "MP3",
+        "existing": ("MP3.",),
+        "label": "MP3s",
+        "summary": "MP3s archived",
+        "description": "Archive MP3s that duplicate FLACs into various archive formats and optionally delete originals.",
+    },
+}
+
+def file_ext(name):
+    """Lowercase extension without the dot, or "" (leading dots don't count, as in splitext)."""
+    base, dot, ext = name.rpartition(".")
+    if not dot or not base.lstrip("."):
+        return ""
+    return ext.lower()
+
+def find_matching(folder, exts, filenames=None):
+    """Return files with an extension in ``exts`` that have a matching FLAC in the same folder.
+
+    ``filenames`` may pass an existing listing (e.g. from os.walk) to avoid rescanning.
+    """
+    if filenames is None:
+        with os.scandir(folder) as it:
+            filenames = [entry.name for entry in it]
+    # One pass: FLAC bases and candidates are sorted out together, with file_ext inlined
+    flac_bases = set()
+    candidates = []
+    for name in filenames:
+        base, dot, ext = name.rpartition(".")
+        if not dot or not base.lstrip("."):
+            continue  # No extension (leading dots don't count, as in splitext)
+        ext = ext.lower()
+        if ext == "flac":
+            flac_bases.add(base)
+        elif ext in exts:
+            candidates.append((name, base))
+    if not flac_bases:
+        return []  # Skip folders with no FLACs
+    return [name for name, base in candidates if base in flac_bases]
+
+def get_archive_command_and_extension(archive_type):
+    """Return the command and file extension for the specified archive type."""
+    # Use every core: 7zz -mmt, xz -T0, and pigz for gzip when it is installed
+    gzip_tar = ["tar", "--use-compress-program=pigz", "-cf"] if shutil.which("pigz") else ["tar", "-czf"]
+    commands = {
+        "7z": (["7zz", "a", "-mx=5", "-mmt=on"], ".7z"),
+        "zip": (["7zz", "a", "-mx=5", "-mmt=on"], ".zip"),
+        "tar.gz": (gzip_tar, ".tar.gz"),
+        "tar.xz": (["tar", "--use-compress-program=xz -T0 -6", "-cf"], ".tar.xz"),
+        "tar.bz2": (["tar", "-cjf"], ".tar.bz2"),
+        "tar.zst": (["tar", "--zstd", "-cf"], ".tar.zst"),
+        "xz": (["xz", "-z", "-T0"], ".xz"),
+        "gzip": (["gzip"], ".gz"),
+        "bzip2": (["bzip2"], ".bz2")
+    }
+    return commands.get(archive_type.lower(), (["7zz", "a", "-mx=5", "-mmt=on"], ".7z"))
+
+def list_archive(archive_path):
+    """Return (member paths, whether the listing tool exited cleanly)."""
+    # Determine archive type and use appropriate command
+    is_tar = archive_path.lower().endswith(('.tar.gz', '.tar.xz', '.tar.bz2', '.tar.zst', '.tar'))
+    if is_tar:
+        result = subprocess.run(["tar", "-tf", archive_path], capture_output=True, text=True)
+    else:
+        # Default to 7zz for 7z, zip, and other formats
+        # -ba -slt: no banner, one "Path = ..." line per entry
+        result = subprocess.run(["7zz", "l", "-ba", "-slt", archive_path], capture_output=True, text=True)
+
+    lines = result.stdout.splitlines()
+    if is_tar:
+        # Tar format - line is just the filename
+        names = [line.strip() for line in lines]
+    else:
+        names = [line[7:] for line in lines if line.startswith("Path = ")]
+    return names, result.returncode == 0
+
+def get_archive_contents(archive_path, exts, out=console, cache=None):
+    """List files with an extension in ``exts`` already inside an existing archive; ``cache`` is consulted and updated."""
+    if cache is None:
+        cache = {}
+    try:
+        stat = os.stat(archive_path)
+        key = os.path.abspath(archive_path)
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            names = entry["names"]
+        else:
+            names, ok = list_archive(archive_path)
+            if ok:
+                cache[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "names": names}
+        return {os.path.basename(name) for name in names if file_ext(name) in exts}
+    except Exception as e:
+        out.print(f"[red]Could not read archive: {archive_path} — {e}[/red]")
+        return set()
+
+@contextmanager
+def file_list(files, separator):
+    """Yield the path of a temporary list file naming ``files``, so no command line grows with the folder."""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".lst", delete=False) as f:
+        f.write(separator.join(files) + separator)
+    try:
+        yield f.name
+    finally:
+        os.remove(f.name)
+
+def pipe_tar_to_compressor(files, folder, compressor, archive_path):
+    """Run `tar -cf - files | compressor > archive_path` without a temp tar on disk."""
+    with open(archive_path, "wb") as archive, file_list(files, "\0") as listing:
+        tar = subprocess.Popen(["tar", "-cf", "-", "--null", "-T", listing], cwd=folder, stdout=subprocess.PIPE)
+        compress = subprocess.Popen(compressor + ["-c"], stdin=tar.stdout, stdout=archive)
+        tar.stdout.close()  # Let tar see SIGPIPE if the compressor exits early
+        compress_rc = compress.wait()
+        tar_rc = tar.wait()
+    if tar_rc or compress_rc:
+        os.remove(archive_path)
+        failed = tar.args if tar_rc else compress.args
+        raise subprocess.CalledProcessError(tar_rc or compress_rc, failed)
+
+def unlink_each(folder, names):
+    """Delete names inside folder, yielding each one as it goes; the folder path is resolved once via dir_fd."""
+    if os.unlink not in os.supports_dir_fd:
+        for name in names:
+            os.remove(os.path.join(folder, name))
+            yield name
+        return
+    dir_fd = os.open(folder, os.O_RDONLY)
+    try:
+        for name in names:
+            os.unlink(name, dir_fd=dir_fd)
+            yield name
+    finally:
+        os.close(dir_fd)
+
+def print_file_lines(out, prefix, style, names):
+    """Print one styled-prefix line per file in a single call, without markup parsing of the names."""
+    if names:
+        out.print(Text("\n").join(Text.assemble((prefix, style), name) for name in names))
+
+def archive_and_delete(folder, files, exts, archive_type="7z", dry_run=False, verbose=False, keep=False, out=console, mode="lossy", listing_cache=None):
+    """Archive matched files into specified format and delete originals unless --keep is set."""
+    settings = MODES[mode]
+    label = settings["label"]
+    archive_ext = get_archive_command_and_extension(archive_type)[1]
+    archive_base = f"{settings['prefix']}{archive_ext}"
+    
+    archive_file = None
+    for f in os.listdir(folder):
+        if f.startswith(settings["existing"]):
+            if file_ext(f) not in exts:
+                archive_file = os.path.join(folder, f)
+                break
+
+    # If an archive already exists, skip files already inside
+    if archive_file:
+        archived_files = get_archive_contents(archive_file, exts, out, listing_cache)
+        to_delete = [f for f in files if f in archived_files]
+        if dry_run or keep:
+            print_file_lines(out, "Would delete already-archived: ", "yellow", to_delete)
+        else:
+            try:
+                deleted = list(unlink_each(folder, to_delete))
+            except Exception as e:
+                out.print(f"[red]Error deleting already-archived files in {folder}: {e}[/red]")
+                return 0
+            if verbose:
+                print_file_lines(out, "Deleted already-archived: ", "green", deleted)
+        files = [f for f in files if f not in archived_files]
+
+    if files:
+        archive_path = os.path.join(folder, archive_base)
+        if dry_run:
+            out.print(f"[yellow]Would archive {len(files)} {label} into {archive_path}[/yellow]")
+            return 0
+        try:
+            cmd, _ = get_archive_command_and_extension(archive_type)
+            # The tools run with cwd=folder, so a relative -d must not leak into the output path
+            target = os.path.abspath(archive_path)
+            
+            if archive_type.lower() in ["tar.gz", "tar.xz", "tar.bz2", "tar.zst"]:
+                # For tar formats, we need to create the archive with all files at once
+                with file_list(files, "\0") as listing:
+                    subprocess.run(cmd + [target, "--null", "-T", listing], cwd=folder, check=True)
+            elif archive_type.lower() in ["xz", "gzip", "bzip2"]:
+                # For single-file compressors, stream the tar straight into the compressor
+                pipe_tar_to_compressor(files, folder, cmd, target)
+            else:
+                # For 7z and zip formats: one @listfile instead of every name on argv
+                with file_list(files, "\n") as listing:
+                    subprocess.run(cmd + ["-scsUTF-8", target, f"@{listing}"], cwd=folder, check=True)
+            
+            if keep:
+                out.print(f"[cyan]{len(files)} {label} archived (kept originals) in:[/cyan] {folder}")
+            else:
+                deleted = list(unlink_each(folder, files))
+                if verbose:
+                    print_file_lines(out, "Archived and deleted: ", "green", deleted)
+                out.print(f"[cyan]{len(files)} {label} archived and deleted in:[/cyan] {folder}")
+            return len(files)
+        except Exception as e:
+            out.print(f"[red]Error archiving in {folder}: {e}[/red]")
+            return 0
+    return 0
+
+def scan_archive(root, exts, archive_type="7z", dry_run=False, verbose=False, keep=False, jobs=None, mode="lossy"):
+    if jobs is None:
+        # Compressors are CPU-bound, so a network mount keeps the CPU-based default rather than REMOTE_WORKERS
+        jobs = default_workers(root, DEFAULT_JOBS, WORKERS_PER_VOLUME, remote_default=DEFAULT_JOBS)
+    total_archived = 0
+    folders = []
+    listing_cache = load_json_cache(LISTING_CACHE_PATH)
+
+    for dirpath, _, filenames in sorted_walk(root):
+        matched = find_matching(dirpath, exts, filenames)
+        if matched:
+            folders.append((dirpath, matched))
+
+    # Each worker renders into its own buffer so folder output stays contiguous
+    def process(job):
+        folder, matched = job
+        text = io.StringIO()
+        buffer = capture_console(console, text)
+        archived = archive_and_delete(folder, matched, exts, archive_type, dry_run, verbose, keep, out=buffer, mode=mode, listing_cache=listing_cache)
+        return folder, archived, text.getvalue()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for index, (folder, archived, output) in enumerate(executor.map(process, folders), 1):
+            console.print(Text(f"\n[{index}/{len(folders)}] {folder}", style="bold"))
+            console.file.write(output)
+            total_archived += archived
+
+    # Dry runs may read the cache but never write anything
+    if not dry_run:
+        save_json_cache(listing_cache, LISTING_CACHE_PATH)
+
+    console.print("\n[bold underline]Summary[/bold underline]")
+    console.print(f"Folders scanned: {len(folders)}")
+    console.print(f"{MODES[mode]['summary']}: {total_archived}")
+    console.print(f"Archive format: {archive_type}")
+    console.print(f"Dry run: {'Yes' if dry_run else 'No'}")
+    console.print(f"Keep originals: {'Yes' if keep else 'No'}")
+
+def main(mode=None, argv=None):
+    """Parse arguments and run the scan; a fixed ``mode`` hides --mode (and --ext for mp3)."""
+    description = MODES[mode or "lossy"]["description"]
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
+    if mode is None:
+        parser.add_argument("--mode", choices=sorted(MODES), default="lossy", help="lossy: all lossy formats as Lossy.*; mp3: MP3s only as MP3.* (default: lossy)")
+    if mode != "mp3":
+        parser.add_argument("--ext", nargs="+", help="Lossy extensions to archive (default: mp3, aac, ogg, m4a, wav)")
+    parser.add_argument("--format", default="7z", choices=["7z", "zip", "tar.gz", "tar.xz", "tar.bz2", "tar.zst", "xz", "gzip", "bzip2"], 
+                       help="Archive format (default: 7z)")
+    parser.add_argument("--dry-run", action="store_true", help="Preview actions without modifying files")
+    parser.add_argument("--verbose", action="store_true", help="Print detailed output per file")
+    parser.add_argument("--keep", action="store_true", help="Archive but keep originals instead of deleting")
+    parser.add_argument("--jobs", type=int, help=f"Folders to archive in parallel (default: {min(DEFAULT_JOBS, WORKERS_PER_VOLUME)} on a local disk, {DEFAULT_JOBS} on network mounts)")
+    args = parser.parse_args(argv)
+    mode = mode or args.mode
+    ext_args = getattr(args, "ext", None)
+    exts = frozenset(ext.lower().lstrip(".") for ext in ext_args) if ext_args else MODES[mode]["exts"]
+    scan_archive(args.directory, exts, args.format, args.dry_run, args.verbose, args.keep, args.jobs, mode)
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,86 @@
 import os
 import argparse
-from mutagen.flac import FLAC
-from mutagen.id3 import ID3, APIC, ID3NoHeaderError
+from concurrent.futures import ThreadPoolExecutor
+from mutagen.flac import Picture
+from mutagen.id3 import ID3, APIC, PIC, ID3NoHeaderError
 from rich.console import Console
+from rich.text import Text
+from utils.describe_folder import describe_folder
+from utils.walk import REMOTE_WORKERS, WORKERS_PER_VOLUME, default_workers, sorted_walk
 
 console = Console()
-AUDIO_EXTS = [".flac", ".mp3"]
+AUDIO_EXTS = frozenset({"flac", "mp3"})
+# Per-folder result lines, built once instead of markup-parsed on every print
+COVER_SAVED = Text("✓ Embedded cover found — cover.jpg saved", style="green")
+COVER_SKIPPED = Text("✓ Embedded cover found — cover.jpg skipped (dry-run)", style="green")
+NO_COVER = Text("– No embedded cover found", style="yellow")
+# Extraction is tag I/O bound, so a few threads per core overlap disk latency
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+# An existing cover.jpg smaller than this is treated as broken and re-extracted
+MIN_COVER_BYTES = 1024
 
 def is_valid_audio(filename):
-    return not filename.startswith(("._", ".")) and any(filename.lower().endswith(ext) for ext in AUDIO_EXTS)
+    _, dot, ext = filename.rpartition(".")
+    return bool(dot) and ext.lower() in AUDIO_EXTS and not filename.startswith(("._", "."))
+
+# Only picture frames (v2.3/2.4 APIC and its v2.2 alias PIC) are decoded; every
+# other ID3 frame is skipped unparsed. PIC is upgraded to APIC on load.
+COVER_ONLY_FRAMES = {"APIC": APIC, "PIC": PIC}
+FLAC_PICTURE_BLOCK = 6
+
+def read_flac_front_cover(audio_path):
+    """Return the first front-cover picture's bytes by walking FLAC block headers, or None."""
+    with open(audio_path, "rb") as f:
+        magic = f.read(4)
+        if magic[:3] == b"ID3":
+            # Some taggers prepend an ID3v2 tag; its synchsafe size sits at bytes 6-9
+            header = magic + f.read(6)
+            if len(header) < 10:
+                return None
+            size = 0
+            for b in header[6:10]:
+                size = (size << 7) | (b & 0x7F)
+            if header[5] & 0x10:  # Footer present
+                size += 10
+            f.seek(10 + size)
+            magic = f.read(4)
+        if magic != b"fLaC":
+            return None
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return None
+            block_type = header[0] & 0x7F
+            size = int.from_bytes(header[1:], "big")
+            if block_type == FLAC_PICTURE_BLOCK:
+                pic = Picture(f.read(size))
+                if pic.type == 3:
+                    return pic.data
+            else:
+                f.seek(size, os.SEEK_CUR)
+            if header[0] & 0x80:  # Last metadata block
+                return None
 
 def extract_embedded_cover(audio_path, output_path, dry_run=False):
     try:
+        data = None
         if audio_path.lower().endswith(".flac"):
-            audio = FLAC(audio_path)
-            for pic in audio.pictures:
-                if pic.type == 3:
-                    if not dry_run:
-                        with open(output_path, "wb") as f:
-                            f.write(pic.data)
-                    return True
+            data = read_flac_front_cover(audio_path)
         elif audio_path.lower().endswith(".mp3"):
             try:
-                audio = ID3(audio_path)
+                audio = ID3(audio_path, known_frames=COVER_ONLY_FRAMES, load_v1=False)
             except ID3NoHeaderError:
                 return False
-            for tag in audio.values():
-                if isinstance(tag, APIC) and tag.type == 3:
-                    if not dry_run:
-                        with open(output_path, "wb") as f:
-                            f.write(tag.data)
-                    return True
+            data = next((tag.data for tag in audio.getall("APIC") if tag.type == 3), None)
+        if data is not None:
+            if not dry_run:
+                with open(output_path, "wb") as f:
+                    f.write(data)
+            return True
     except Exception as e:
         console.print(f"[red]Error extracting from {audio_path}: {e}[/red]")
     return False
 
-def describe_folder(folder):
-    parts = folder.strip(os.sep).split(os.sep)
-    if len(parts) >= 3:
-        return parts[-3], parts[-2], parts[-1]  # letter, artist, album
-    elif len(parts) >= 2:
-        return parts[-2], parts[-1], ""
-    else:
-        return "", parts[-1], ""
-
 def process_album_folder(folder, dry_run=False):
     for filename in sorted(os.listdir(folder)):
         if is_valid_audio(filename):
@@ -52,29 +89,44 @@ def process_album_folder(folder, dry_run=False):
             return extract_embedded_cover(audio_path, cover_path, dry_run)
     return False
 
-def scan_archive(root_path, dry_run=False, verbose=False):
+def has_valid_cover(folder, filenames):
+    if "cover.jpg" not in filenames:
+        return False
+    try:
+        return os.stat(os.path.join(folder, "cover.jpg")).st_size > MIN_COVER_BYTES
+    except OSError:
+        return False
+
+def scan_archive(root_path, dry_run=False, verbose=False, workers=None, force=False):
+    if workers is None:
+        workers = default_workers(root_path, DEFAULT_WORKERS, WORKERS_PER_VOLUME)
     folders = []
-    for dirpath, _, filenames in os.walk(root_path):
+    skipped = 0
+    for dirpath, _, filenames in sorted_walk(root_path):
         if any(is_valid_audio(f) for f in filenames):
+            if not force and has_valid_cover(dirpath, filenames):
+                skipped += 1
+                continue
             folders.append(dirpath)
 
     total = len(folders)
     covers_extracted = 0
 
-    for index, folder in enumerate(folders, 1):
-        letter, artist, album = describe_folder(folder)
-        console.print(f"\n[{index}/{total}] {letter} / {artist} / {album}", style="bold")
-        success = process_album_folder(folder, dry_run)
-        if success:
-            msg = "cover.jpg saved" if not dry_run else "cover.jpg skipped (dry-run)"
-            console.print(f"[green]✓ Embedded cover found — {msg}[/green]")
-            covers_extracted += 1
-        else:
-            console.print(f"[yellow]– No embedded cover found[/yellow]")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda folder: process_album_folder(folder, dry_run), folders)
+        for index, (folder, success) in enumerate(zip(folders, results), 1):
+            letter, artist, album = describe_folder(folder)
+            console.print(Text(f"\n[{index}/{total}] {letter} / {artist} / {album}", style="bold"))
+            if success:
+                console.print(COVER_SKIPPED if dry_run else COVER_SAVED)
+                covers_extracted += 1
+            else:
+                console.print(NO_COVER)
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Folders scanned: {total}")
     console.print(f"Covers extracted: {covers_extracted}")
+    console.print(f"Skipped (cover.jpg exists): {skipped}")
     console.print(f"Dry run: {'Yes' if dry_run else 'No'}")
 
 if __name__ == "__main__":
@@ -82,5 +134,7 @@ if __name__ == "__main__":
     parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without writing files")
     parser.add_argument("--verbose", action="store_true", help="Reserved for future verbosity toggle")
+    parser.add_argument("--force", action="store_true", help="Re-extract even when cover.jpg already exists")
+    parser.add_argument("--workers", type=int, help=f"Folders processed in parallel (default: {min(DEFAULT_WORKERS, WORKERS_PER_VOLUME)} on a local disk, {REMOTE_WORKERS} on network mounts)")
     args = parser.parse_args()
-    scan_archive(args.directory, args.dry_run, args.verbose)
\ No newline at end of file
+    scan_archive(args.directory, args.dry_run, args.verbose, args.workers, args.force)
\ No newline at end of file
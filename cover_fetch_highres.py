@@ -2,6 +2,8 @@ import os
 import sys
 import argparse
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Auto-activate virtual environment
@@ -13,14 +15,20 @@ if venv_python.exists() and sys.executable != str(venv_python):
 
 from PIL import Image
 from rich.console import Console
+from utils.describe_folder import describe_folder
+from utils.walk import REMOTE_WORKERS, WORKERS_PER_VOLUME, default_workers, sorted_walk
 
 console = Console()
 MIN_WIDTH = 1000
 MIN_HEIGHT = 1000
-AUDIO_EXTS = [".flac", ".mp3", ".m4a", ".ogg", ".wav"]
+AUDIO_EXTS = frozenset({"flac", "mp3", "m4a", "ogg", "wav"})
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+# At most this many COVIT processes query covers.musichoarders.xyz at once
+COVIT_SLOTS = threading.Semaphore(4)
 
 def is_audio_file(filename):
-    return any(filename.lower().endswith(ext) for ext in AUDIO_EXTS)
+    _, dot, ext = filename.rpartition(".")
+    return bool(dot) and ext.lower() in AUDIO_EXTS and not filename.startswith(("._", "."))
 
 def get_cover_dimensions(cover_path):
     try:
@@ -41,15 +49,6 @@ def should_replace_cover(cover_path):
     width, height = get_cover_dimensions(cover_path)
     return width < MIN_WIDTH or height < MIN_HEIGHT
 
-def describe_folder(folder):
-    parts = folder.strip(os.sep).split(os.sep)
-    if len(parts) >= 3:
-        return parts[-3], parts[-2], parts[-1]
-    elif len(parts) >= 2:
-        return parts[-2], parts[-1], ""
-    else:
-        return "", parts[-1], ""
-
 def process_album_folder(folder, dry_run=False):
     cover_path = os.path.join(folder, "cover.jpg")
     if should_replace_cover(cover_path):
@@ -64,15 +63,16 @@ def process_album_folder(folder, dry_run=False):
                 if not covit_path.exists():
                     return f"COVIT not found at {covit_path}. Please install COVIT first."
                 
-                subprocess.run([
-                    str(covit_path),
-                    "--address", "covers.musichoarders.xyz",
-                    "--input", audio_file,
-                    "--query-sources", "applemusic,amazonmusic,bandcamp,deezer",
-                    "--query-resolution", "1000",
-                    "--primary-output", "cover",
-                    "--primary-overwrite"
-                ], cwd=folder)
+                with COVIT_SLOTS:
+                    subprocess.run([
+                        str(covit_path),
+                        "--address", "covers.musichoarders.xyz",
+                        "--input", audio_file,
+                        "--query-sources", "applemusic,amazonmusic,bandcamp,deezer",
+                        "--query-resolution", "1000",
+                        "--primary-output", "cover",
+                        "--primary-overwrite"
+                    ], cwd=folder)
                 return "Cover fetched via COVIT"
             except Exception as e:
                 return f"Error fetching cover: {e}"
@@ -81,9 +81,11 @@ def process_album_folder(folder, dry_run=False):
     else:
         return "Cover already high-res"
 
-def scan_archive(root_path, dry_run=False, verbose=False):
+def scan_archive(root_path, dry_run=False, verbose=False, workers=None):
+    if workers is None:
+        workers = default_workers(root_path, DEFAULT_WORKERS, WORKERS_PER_VOLUME)
     folders = []
-    for dirpath, _, filenames in os.walk(root_path):
+    for dirpath, _, filenames in sorted_walk(root_path):
         if any(is_audio_file(f) for f in filenames):
             folders.append(dirpath)
 
@@ -92,23 +94,24 @@ def scan_archive(root_path, dry_run=False, verbose=False):
     skipped = 0
     errors = 0
 
-    for index, folder in enumerate(folders, 1):
-        letter, artist, album = describe_folder(folder)
-        console.print(f"\n[{index}/{total}] {letter} / {artist} / {album}", style="bold")
-        result = process_album_folder(folder, dry_run)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda folder: process_album_folder(folder, dry_run), folders)
+        for index, (folder, result) in enumerate(zip(folders, results), 1):
+            letter, artist, album = describe_folder(folder)
+            console.print(f"\n[{index}/{total}] {letter} / {artist} / {album}", style="bold")
 
-        if "Cover fetched" in result:
-            console.print(f"[green]{result}[/green]")
-            fetched += 1
-        elif "already high-res" in result:
-            console.print(f"[cyan]{result}[/cyan]")
-            skipped += 1
-        elif "Would launch" in result:
-            console.print(f"[yellow]{result}[/yellow]")
-            skipped += 1
-        else:
-            console.print(f"[red]{result}[/red]")
-            errors += 1
+            if "Cover fetched" in result:
+                console.print(f"[green]{result}[/green]")
+                fetched += 1
+            elif "already high-res" in result:
+                console.print(f"[cyan]{result}[/cyan]")
+                skipped += 1
+            elif "Would launch" in result:
+                console.print(f"[yellow]{result}[/yellow]")
+                skipped += 1
+            else:
+                console.print(f"[red]{result}[/red]")
+                errors += 1
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Folders scanned: {total}")
@@ -123,6 +126,7 @@ if __name__ == "__main__":
     parser.add_argument("--archive", help="Archive directory to scan (alternative to -d)")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without launching COVIT")
     parser.add_argument("--verbose", action="store_true", help="Reserved for future verbosity toggle")
+    parser.add_argument("--workers", type=int, help=f"Folders processed in parallel (default: {min(DEFAULT_WORKERS, WORKERS_PER_VOLUME)} on a local disk, {REMOTE_WORKERS} on network mounts)")
     args = parser.parse_args()
     
     # Determine the directory to scan
@@ -131,4 +135,4 @@ if __name__ == "__main__":
         print("❌ Error: Please specify a directory with -d or --archive")
         sys.exit(1)
         
-    scan_archive(target_dir, args.dry_run, args.verbose)
\ No newline at end of file
+    scan_archive(target_dir, args.dry_run, args.verbose, args.workers)
\ No newline at end of file
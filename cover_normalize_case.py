@@ -6,7 +6,8 @@ Renames things like 'Cover.JPG' → 'cover.jpg', 'Folder.JPEG' → 'cover.jpg'.
 
 from pathlib import Path
 import argparse
-from typing import List, Tuple
+import os
+from typing import Iterator, List, Tuple, Union
 
 class CaseNormalizer:
     TARGET_NAMES = {
@@ -15,34 +16,60 @@ class CaseNormalizer:
         "artist.jpg": {"artist.jpg", "folder.jpg"}  # for artist-level folders
     }
 
+    # Flat variant -> target lookup. "folder.jpg" is listed under both targets;
+    # building in reverse lets the first one (cover.jpg) win, as it did when the
+    # sets were checked in order.
+    VARIANT_TO_TARGET = {
+        variant: target
+        for target, variants in reversed(list(TARGET_NAMES.items()))
+        for variant in variants
+    }
+
     def __init__(self, archive_root: Path):
         self.root = Path(archive_root)
 
-    def check_file(self, file: Path) -> Tuple[bool, str]:
+    def check_file(self, file: Union[Path, os.DirEntry]) -> Tuple[bool, str]:
         """
-        Check if file matches a target name (case-insensitive).
+        Check if file (a Path or scandir entry) matches a target name (case-insensitive).
         Returns (needs_fix, suggested_name).
         """
-        lower = file.name.lower()
-        for target, variants in self.TARGET_NAMES.items():
-            if lower in variants:
-                if file.name != target:
-                    return True, target
+        target = self.VARIANT_TO_TARGET.get(file.name.lower())
+        if target is not None and file.name != target:
+            return True, target
         return False, ""
 
+    @staticmethod
+    def _walk_files(root: Path) -> Iterator[os.DirEntry]:
+        """
+        Yield file entries under root using scandir's cached d_type (no stat per file).
+        """
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError:
+                continue
+
     def scan_archive(self, dry_run: bool = True) -> dict:
         """
         Scan archive and optionally fix filenames.
         """
         results = {"fixed": [], "skipped": [], "clean": 0, "errors": []}
 
-        for file in self.root.rglob("*"):
-            if not file.is_file() or file.name.startswith("."):
+        for entry in self._walk_files(self.root):
+            if entry.name.startswith("."):
                 continue
 
-            needs_fix, suggested = self.check_file(file)
+            # Only lookup hits become Path objects; everything else is counted as clean
+            needs_fix, target = self.check_file(entry)
             if needs_fix:
-                dest = file.with_name(suggested)
+                file = Path(entry.path)
+                dest = file.with_name(target)
                 if dest.exists():
                     results["skipped"].append(str(file))
                     continue
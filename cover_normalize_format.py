@@ -1,12 +1,20 @@
 import os
 import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from PIL import Image
 from rich.console import Console
+from utils.describe_folder import describe_folder
+from utils.walk import walk_entries
 
 console = Console()
 
-AUDIO_EXTENSIONS = {".flac", ".mp3", ".wav", ".m4a", ".aac", ".ogg", ".aif", ".aiff"}
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+AUDIO_EXTENSIONS = frozenset({".flac", ".mp3", ".wav", ".m4a", ".aac", ".ogg", ".aif", ".aiff"})
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+# Album images that get renamed to cover.jpg (compared lowercase)
+RENAME_TO_COVER = frozenset({"folder.jpg", "folder.jpeg", "album cover.jpg", "album cover.jpeg", "albumartsmall.jpg"})
+# PNG decode + JPEG encode is CPU-bound, so conversions get one process per core
+DEFAULT_WORKERS = os.cpu_count() or 1
 
 def is_audio_file(filename):
     return os.path.splitext(filename)[1].lower() in AUDIO_EXTENSIONS
@@ -18,10 +26,13 @@ def convert_to_jpg(path, dry_run=False):
     try:
         if dry_run:
             return "Would convert to JPG"
-        img = Image.open(path)
-        rgb = img.convert("RGB")
         new_path = os.path.splitext(path)[0] + ".jpg"
-        rgb.save(new_path, "JPEG", quality=90)
+        with Image.open(path) as img:
+            if img.mode == "RGB":
+                rgb = img  # Already JPEG-compatible; skip the extra full-size copy
+            else:
+                rgb = img.convert("RGB")
+            rgb.save(new_path, "JPEG", quality=90)
         os.remove(path)
         return f"Converted to JPG: {new_path}"
     except Exception as e:
@@ -29,21 +40,33 @@ def convert_to_jpg(path, dry_run=False):
 
 def safe_rename(src, dest_folder, dry_run=False):
     dest_path = os.path.join(dest_folder, "cover.jpg")
-    if not os.path.exists(dest_path):
-        if dry_run:
-            return f"Would rename {os.path.basename(src)} → cover.jpg"
+    if os.path.lexists(dest_path):
+        return f"Skipped rename (cover.jpg already exists)"
+    if dry_run:
+        return f"Would rename {os.path.basename(src)} → cover.jpg"
+    try:
         os.rename(src, dest_path)
         return f"Renamed {os.path.basename(src)} → cover.jpg"
-    else:
-        return f"Skipped rename (cover.jpg already exists)"
+    except OSError as e:
+        return f"Error renaming {os.path.basename(src)}: {e}"
 
-def normalize_album_folder(folder, dry_run=False):
+def normalize_album_folder(folder, dry_run=False, executor=None, entries=None):
+    """Apply cover fixes; with an executor, PNG conversions are submitted and returned as futures.
+    Pass the walk's DirEntry objects as entries to skip listing the folder again."""
     actions = []
-    for f in os.listdir(folder):
-        lower = f.lower()
-        full_path = os.path.join(folder, f)
+    if entries is None:
+        with os.scandir(folder) as it:
+            entries = list(it)
+    for entry in entries:
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        f = entry.name
+        lower = f.lower()  # Lowered once; every check below works off lower/ext
+        dot = lower.rfind(".")
+        ext = lower[dot:] if dot >= 0 else ""
+        full_path = entry.path
 
-        if lower.startswith("cdart.") and is_image_file(f):
+        if ext in IMAGE_EXTENSIONS and lower.startswith("cdart."):
             try:
                 if dry_run:
                     actions.append(f"Would delete cdart: {full_path}")
@@ -57,11 +80,14 @@ def normalize_album_folder(folder, dry_run=False):
         if f == "logo.png":
             continue
 
-        if lower.endswith(".png"):
-            actions.append(convert_to_jpg(full_path, dry_run))
+        if ext == ".png":
+            if executor is not None and not dry_run:
+                actions.append(executor.submit(convert_to_jpg, full_path))
+            else:
+                actions.append(convert_to_jpg(full_path, dry_run))
             continue
 
-        if lower in {"folder.jpg", "folder.jpeg", "album cover.jpg", "album cover.jpeg", "albumartsmall.jpg"} or lower.endswith(".jpeg"):
+        if ext == ".jpeg" or lower in RENAME_TO_COVER:
             actions.append(safe_rename(full_path, folder, dry_run))
     return actions
 
@@ -78,37 +104,53 @@ def normalize_artist_folder(folder, dry_run=False):
             return [f"Error renaming artist image: {e}"]
     return []
 
-def describe_folder(folder):
-    parts = folder.strip(os.sep).split(os.sep)
-    if len(parts) >= 3:
-        return parts[-3], parts[-2], parts[-1]
-    elif len(parts) >= 2:
-        return parts[-2], parts[-1], ""
-    else:
-        return "", parts[-1], ""
-
-def scan_archive(root, dry_run=False, verbose=False):
-    folders = []
-    for dirpath, _, filenames in os.walk(root):
-        if any(is_audio_file(f) for f in filenames):
-            folders.append((dirpath, True))
-        elif "folder.jpg" in [f.lower() for f in filenames]:
-            folders.append((dirpath, False))
-
-    total = len(folders)
-    cleaned = 0
-
-    for index, (folder, is_album) in enumerate(folders, 1):
-        letter, artist, album = describe_folder(folder)
-        console.print(f"\n[{index}/{total}] {letter} / {artist} / {album}", style="bold")
-
-        actions = normalize_album_folder(folder, dry_run) if is_album else normalize_artist_folder(folder, dry_run)
-        if actions:
-            cleaned += 1
-            for line in actions:
-                console.print(f"[green]{line}[/green]")
+def iter_candidate_folders(root):
+    """Yield (folder, is_album, file entries) as the walk finds them: albums hold audio, artist folders a folder.jpg."""
+    splitext = os.path.splitext
+    for dirpath, files in walk_entries(root):
+        # One pass per folder: any audio file makes it an album, else look for an artist folder.jpg
+        has_folder_jpg = False
+        for entry in files:
+            f = entry.name
+            if splitext(f)[1].lower() in AUDIO_EXTENSIONS:
+                yield dirpath, True, files
+                break
+            if not has_folder_jpg and f.lower() == "folder.jpg":
+                has_folder_jpg = True
         else:
-            console.print("[cyan]No changes needed[/cyan]")
+            if has_folder_jpg:
+                yield dirpath, False, files
+
+def report_folder(index, folder, actions):
+    """Print one folder's results, waiting on any pending conversions; returns True if anything changed."""
+    letter, artist, album = describe_folder(folder)
+    console.print(f"\n[{index}] {letter} / {artist} / {album}", style="bold")
+    if not actions:
+        console.print("[cyan]No changes needed[/cyan]")
+        return False
+    lines = (line.result() if isinstance(line, Future) else line for line in actions)
+    console.print("\n".join(f"[green]{line}[/green]" for line in lines))
+    return True
+
+def scan_archive(root, dry_run=False, verbose=False, workers=DEFAULT_WORKERS):
+    total = 0
+    cleaned = 0
+    # Folders whose conversions may still be running; reported oldest-first once the window fills,
+    # so work starts while the walk is still going and memory stays bounded on huge trees
+    pending = deque()
+    window = max(1, workers) * 4
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        # Renames and deletes run here in order; PNG conversions fan out to the pool meanwhile
+        for folder, is_album, entries in iter_candidate_folders(root):
+            total += 1
+            # Album fixes reuse the walk's entries, so each path comes pre-joined as entry.path
+            actions = normalize_album_folder(folder, dry_run, executor, entries) if is_album else normalize_artist_folder(folder, dry_run)
+            pending.append((total, folder, actions))
+            if len(pending) > window:
+                cleaned += report_folder(*pending.popleft())
+        while pending:
+            cleaned += report_folder(*pending.popleft())
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Folders scanned: {total}")
@@ -120,5 +162,6 @@ if __name__ == "__main__":
     parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without making changes")
     parser.add_argument("--verbose", action="store_true", help="Reserved for future verbosity toggle")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Parallel PNG conversion processes (default: {DEFAULT_WORKERS})")
     args = parser.parse_args()
-    scan_archive(args.directory, args.dry_run, args.verbose)
\ No newline at end of file
+    scan_archive(args.directory, args.dry_run, args.verbose, args.workers)
\ No newline at end of file
@@ -6,140 +6,140 @@ or only contain cover images (cover.jpg, folder.jpg, etc.).
 
 import os
 import argparse
-from pathlib import Path
+from collections import Counter
 from rich.console import Console
+from utils.output import ConsoleBuffer
 
 console = Console()
 
 # Common cover image filenames (case-insensitive)
-COVER_NAMES = {
+COVER_NAMES = frozenset({
     "cover.jpg", "cover.jpeg", "cover.png", "cover.webp",
     "folder.jpg", "folder.jpeg", "folder.png", "folder.webp",
     "album cover.jpg", "album cover.jpeg",
     "albumartsmall.jpg", "artist.jpg"
-}
+})
 
-def is_cover_file(filename):
-    """Check if a file is a cover image."""
-    return filename.lower() in COVER_NAMES
-
-def is_empty_or_cover_only(folder_path):
+def is_empty_or_cover_only(folder_path, dirnames=None, filenames=None):
     """
     Check if folder is empty or only contains cover images.
-    Returns (is_empty_or_cover_only, contents_list).
+    Returns (is_empty_or_cover_only, contents_list); contents is None when the answer is no.
+    Pass dirnames/filenames from os.walk to reuse that listing instead of rescanning.
     """
+    covers = COVER_NAMES
+    if filenames is not None:
+        # If there are subdirectories, it's not empty
+        if dirnames:
+            return False, None
+        # If all files are cover images, it's considered empty; all() stops at the first other file
+        if all(name.lower() in covers for name in filenames):
+            return True, list(filenames)
+        return False, None
+
     try:
-        contents = list(Path(folder_path).iterdir())
-        if not contents:
-            return True, []
-        
-        # Check if all items are cover images
-        non_cover = []
-        for item in contents:
-            if item.is_dir():
-                # If there are subdirectories, it's not empty
-                return False, contents
-            if not is_cover_file(item.name):
-                non_cover.append(item.name)
-        
-        # If all files are cover images, it's considered empty
-        return len(non_cover) == 0, [item.name for item in contents]
+        contents = []
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                # DirEntry.is_dir() uses the d_type from readdir, so this costs no extra stat;
+                # stop at the first subfolder or non-cover file instead of listing everything
+                if entry.is_dir(follow_symlinks=False) or entry.name.lower() not in covers:
+                    return False, None
+                contents.append(entry.name)
+        return True, contents
     except PermissionError:
-        return None, []  # Can't access, skip
+        return None, None  # Can't access, skip
+
+def remove_folder(folder_path, contents, dry_run, verbose, delete_covers, stats, out):
+    """Delete (or preview deleting) one empty or cover-only folder, counting into stats."""
+    if not contents:
+        if dry_run:
+            out.add(f"[cyan]Would delete empty folder:[/cyan] {folder_path}")
+            return
+        try:
+            os.rmdir(folder_path)
+            stats["deleted_empty"] += 1
+            if verbose:
+                out.add(f"[green]✓ Deleted empty folder:[/green] {folder_path}")
+        except OSError as e:
+            out.add(f"[red]Could not delete {folder_path}: {e}[/red]")
+        return
+
+    if dry_run:
+        cover_list = ", ".join(contents)
+        out.add(f"[cyan]Would delete cover-only folder:[/cyan] {folder_path} ({cover_list})")
+        if delete_covers:
+            for cover in contents:
+                out.add(f"  [cyan]Would delete cover:[/cyan] {os.path.join(folder_path, cover)}")
+        return
+
+    # Delete cover files if requested
+    if delete_covers:
+        for cover in contents:
+            try:
+                cover_path = os.path.join(folder_path, cover)
+                os.remove(cover_path)
+                stats["deleted_covers"] += 1
+                if verbose:
+                    out.add(f"[green]✓ Deleted cover:[/green] {cover_path}")
+            except Exception as e:
+                out.add(f"[red]Could not delete {cover_path}: {e}[/red]")
+
+    # Delete the folder itself
+    try:
+        os.rmdir(folder_path)
+        stats["deleted_cover_only"] += 1
+        if verbose:
+            out.add(f"[green]✓ Deleted cover-only folder:[/green] {folder_path}")
+    except OSError as e:
+        out.add(f"[red]Could not delete {folder_path}: {e}[/red]")
 
 def scan_and_clean(root, dry_run=False, verbose=False, delete_covers=False):
     """
     Scan directory tree for empty folders or folders with only cover images.
     """
-    root_path = Path(root)
-    empty_folders = []
-    cover_only_folders = []
+    stats = Counter()
     total_scanned = 0
-    
-    # Walk through all directories (bottom-up to handle nested empty folders)
-    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
-        total_scanned += 1
-        folder_path = Path(dirpath)
-        
-        # Skip if it's the root directory itself
-        if folder_path == root_path:
-            continue
+
+    # Per-folder messages are batched into a few large prints
+    with ConsoleBuffer(console) as out:
+        # Walk through all directories (bottom-up to handle nested empty folders).
+        # Each folder is acted on as soon as it's classified, so no list of matches builds up;
+        # a parent's listing is taken before its children are visited, so deleting them here
+        # doesn't change which parents count as empty.
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            total_scanned += 1
+            # Skip if it's the root directory itself (os.walk yields it exactly as given)
+            if dirpath == root:
+                continue
         
-        is_empty, contents = is_empty_or_cover_only(dirpath)
+            is_empty, contents = is_empty_or_cover_only(dirpath, dirnames, filenames)
         
-        if is_empty is None:
-            # Permission error, skip
-            continue
+            if is_empty is None:
+                # Permission error, skip
+                continue
         
-        if is_empty:
-            if not contents:
-                empty_folders.append((dirpath, []))
-                if verbose:
-                    console.print(f"[yellow]Empty folder:[/yellow] {dirpath}")
-            else:
-                cover_only_folders.append((dirpath, contents))
-                if verbose:
-                    cover_list = ", ".join(contents)
-                    console.print(f"[yellow]Cover-only folder:[/yellow] {dirpath} ({cover_list})")
-    
-    # Remove folders
-    deleted_empty = 0
-    deleted_cover_only = 0
-    deleted_covers = 0
-    
-    # Process empty folders first
-    for folder_path, _ in empty_folders:
-        if dry_run:
-            console.print(f"[cyan]Would delete empty folder:[/cyan] {folder_path}")
-        else:
-            try:
-                os.rmdir(folder_path)
-                deleted_empty += 1
-                if verbose:
-                    console.print(f"[green]✓ Deleted empty folder:[/green] {folder_path}")
-            except OSError as e:
-                console.print(f"[red]Could not delete {folder_path}: {e}[/red]")
-    
-    # Process cover-only folders
-    for folder_path, contents in cover_only_folders:
-        if dry_run:
-            cover_list = ", ".join(contents)
-            console.print(f"[cyan]Would delete cover-only folder:[/cyan] {folder_path} ({cover_list})")
-            if delete_covers:
-                for cover in contents:
-                    console.print(f"  [cyan]Would delete cover:[/cyan] {os.path.join(folder_path, cover)}")
-        else:
-            # Delete cover files if requested
-            if delete_covers:
-                for cover in contents:
-                    try:
-                        cover_path = os.path.join(folder_path, cover)
-                        os.remove(cover_path)
-                        deleted_covers += 1
-                        if verbose:
-                            console.print(f"[green]✓ Deleted cover:[/green] {cover_path}")
-                    except Exception as e:
-                        console.print(f"[red]Could not delete {cover_path}: {e}[/red]")
-            
-            # Delete the folder itself
-            try:
-                os.rmdir(folder_path)
-                deleted_cover_only += 1
-                if verbose:
-                    console.print(f"[green]✓ Deleted cover-only folder:[/green] {folder_path}")
-            except OSError as e:
-                console.print(f"[red]Could not delete {folder_path}: {e}[/red]")
+            if is_empty:
+                if not contents:
+                    stats["empty"] += 1
+                    if verbose:
+                        out.add(f"[yellow]Empty folder:[/yellow] {dirpath}")
+                else:
+                    stats["cover_only"] += 1
+                    if verbose:
+                        cover_list = ", ".join(contents)
+                        out.add(f"[yellow]Cover-only folder:[/yellow] {dirpath} ({cover_list})")
+                remove_folder(dirpath, contents, dry_run, verbose, delete_covers, stats, out)
     
     # Summary
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Folders scanned: {total_scanned}")
-    console.print(f"Empty folders found: {len(empty_folders)}")
-    console.print(f"Cover-only folders found: {len(cover_only_folders)}")
+    console.print(f"Empty folders found: {stats['empty']}")
+    console.print(f"Cover-only folders found: {stats['cover_only']}")
     if not dry_run:
-        console.print(f"Empty folders deleted: {deleted_empty}")
-        console.print(f"Cover-only folders deleted: {deleted_cover_only}")
+        console.print(f"Empty folders deleted: {stats['deleted_empty']}")
+        console.print(f"Cover-only folders deleted: {stats['deleted_cover_only']}")
         if delete_covers:
-            console.print(f"Cover files deleted: {deleted_covers}")
+            console.print(f"Cover files deleted: {stats['deleted_covers']}")
     console.print(f"Dry run: {'Yes' if dry_run else 'No'}")
 
 if __name__ == "__main__":
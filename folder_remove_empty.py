@@ -1,40 +1,50 @@
 import os
 import argparse
-import shutil
 from rich.console import Console
+from utils.output import ConsoleBuffer
 
 console = Console()
 
-AUDIO_EXTENSIONS = {".flac", ".mp3", ".wav", ".m4a", ".aac", ".ogg", ".aif", ".aiff"}
-
-def contains_audio_files(folder):
-    for root, _, files in os.walk(folder):
-        for f in files:
-            if os.path.splitext(f)[1].lower() in AUDIO_EXTENSIONS:
-                return True
-    return False
+AUDIO_EXTENSIONS = frozenset({".flac", ".mp3", ".wav", ".m4a", ".aac", ".ogg", ".aif", ".aiff"})
 
 def prune_empty_folders(root, dry_run=False, verbose=False):
     scanned = 0
     removed = 0
     errors = 0
 
-    for dirpath, dirnames, _ in os.walk(root, topdown=False):
-        for dirname in dirnames:
-            full_path = os.path.join(dirpath, dirname)
-            scanned += 1
-            if os.path.isdir(full_path) and not contains_audio_files(full_path):
+    with ConsoleBuffer(console) as out:
+        # Bottom-up, so each child's answer is known before its parent: a folder holds audio
+        # if it has an audio file itself or any subfolder does. One walk instead of one per folder.
+        has_audio = {}
+        # Non-audio files of audio-free folders, kept from the walk so deletion needs no rescan
+        leftover_files = {}
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            audio_here = any(os.path.splitext(f)[1].lower() in AUDIO_EXTENSIONS for f in filenames)
+            for dirname in dirnames:
+                full_path = os.path.join(dirpath, dirname)
+                scanned += 1
+                # Folders the walk never entered (symlinks, unreadable) are treated as keepers
+                if has_audio.pop(full_path, True):
+                    audio_here = True
+                    continue
+                files = leftover_files.pop(full_path, [])
                 if dry_run:
-                    console.print(f"[yellow]Would delete:[/yellow] {full_path}")
+                    out.add(f"[yellow]Would delete:[/yellow] {full_path}")
                     continue
                 try:
-                    shutil.rmtree(full_path)
+                    # Subfolders were removed when this folder was visited, so only files remain
+                    for f in files:
+                        os.unlink(os.path.join(full_path, f))
+                    os.rmdir(full_path)
                     if verbose:
-                        console.print(f"[green]Deleted:[/green] {full_path}")
+                        out.add(f"[green]Deleted:[/green] {full_path}")
                     removed += 1
                 except Exception as e:
-                    console.print(f"[red]Error deleting {full_path}: {e}[/red]")
+                    out.add(f"[red]Error deleting {full_path}: {e}[/red]")
                     errors += 1
+            has_audio[dirpath] = audio_here
+            if not audio_here:
+                leftover_files[dirpath] = filenames
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Folders scanned: {scanned}")
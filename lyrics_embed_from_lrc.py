@@ -1,15 +1,38 @@
 import os
 import re
 import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from mutagen.flac import FLAC
 from mutagen.id3 import USLT, ID3, ID3NoHeaderError
 from rich.console import Console
+from utils.describe_folder import describe_folder
+from utils.walk import REMOTE_WORKERS, default_workers, walk_entries
 
 console = Console()
-AUDIO_EXTS = [".flac", ".mp3"]
+AUDIO_EXTS = frozenset({".flac", ".mp3"})
+# Tag I/O waits on disk, so run several files per core
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def strip_timestamps(text):
-    return re.sub(r"\[\d{1,2}:\d{2}(?:\.\d{1,2})?\]", "", text).strip()
+# LRC line timestamps such as [01:23] or [01:23.45], matched on the raw bytes
+TIMESTAMP_RE = re.compile(rb"\[\d{1,2}:\d{2}(?:\.\d{1,2})?\]")
+
+# Slack left behind whenever a tag block has to grow, so later edits fit in place
+PADDING_SLACK = 4096
+
+def keep_padding(info):
+    """Padding policy for tag saves: reuse whatever padding is left so the file isn't rewritten."""
+    # mutagen's default trims large padding, which forces a full rewrite of the audio data
+    return info.padding if info.padding >= 0 else PADDING_SLACK
+
+def read_lyrics(lrc_path):
+    """Read an LRC file as bytes, strip timestamps, then decode once (dropping any BOM)."""
+    with open(lrc_path, "rb") as f:
+        data = TIMESTAMP_RE.sub(b"", f.read())
+    if b"\r" in data:
+        # Match the newline translation text mode used to do
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data.decode("utf-8-sig").strip()
 
 def find_lrc(audio_path):
     base = os.path.splitext(os.path.basename(audio_path))[0]
@@ -23,135 +46,158 @@ def find_lrc(audio_path):
             return path
     return None
 
-def has_embedded_lyrics(audio_path):
-    """Check if file already has embedded lyrics."""
+def open_tags(audio_path, ext):
+    """Parse the file's tags (an empty ID3 when an MP3 has none); errors propagate."""
+    if ext == ".flac":
+        return FLAC(audio_path)
+    elif ext == ".mp3":
+        try:
+            return ID3(audio_path)
+        except ID3NoHeaderError:
+            return ID3()
+    return None
+
+def load_tags(audio_path, ext):
+    """Parse the file's tags once for both the lyrics check and the write (None if unreadable)."""
     try:
-        if audio_path.lower().endswith(".flac"):
-            audio = FLAC(audio_path)
-            return "LYRICS" in audio
-        elif audio_path.lower().endswith(".mp3"):
-            tags = ID3(audio_path)
-            return any(isinstance(tag, USLT) for tag in tags.values())
+        return open_tags(audio_path, ext)
     except Exception:
-        return False
+        return None
+
+def has_embedded_lyrics(audio_path, tags=None):
+    """Check if file already has embedded lyrics."""
+    if tags is None:
+        tags = load_tags(audio_path, os.path.splitext(audio_path)[1].lower())
+    if isinstance(tags, FLAC):
+        return "LYRICS" in tags
+    if isinstance(tags, ID3):
+        return bool(tags.getall("USLT"))
     return False
 
-def embed_lyrics(audio_path, lrc_path, dry_run=False):
+def embed_lyrics(audio_path, lrc_path, dry_run=False, tags=None):
     try:
-        with open(lrc_path, "r", encoding="utf-8") as f:
-            lyrics = strip_timestamps(f.read())
+        lyrics = read_lyrics(lrc_path)
         if dry_run:
             return True
-        if audio_path.lower().endswith(".flac"):
-            audio = FLAC(audio_path)
-            audio["LYRICS"] = lyrics
-            audio.save()
-        elif audio_path.lower().endswith(".mp3"):
-            try:
-                tags = ID3(audio_path)
-            except ID3NoHeaderError:
-                tags = ID3()
+        if tags is None:
+            tags = open_tags(audio_path, os.path.splitext(audio_path)[1].lower())
+        if isinstance(tags, FLAC):
+            tags["LYRICS"] = lyrics
+            tags.save(padding=keep_padding)
+        elif isinstance(tags, ID3):
             tags.add(USLT(encoding=3, lang="eng", desc="", text=lyrics))
-            tags.save(audio_path)
+            tags.save(audio_path, padding=keep_padding)
         return True
     except Exception as e:
         console.print(f"[red]Failed to embed: {audio_path} — {e}[/red]")
         return False
 
-def describe_folder(folder):
-    parts = folder.strip(os.sep).split(os.sep)
-    if len(parts) >= 3:
-        return parts[-3], parts[-2], parts[-1]
-    elif len(parts) >= 2:
-        return parts[-2], parts[-1], ""
-    else:
-        return "", parts[-1], ""
-
-def scan_archive(root, dry_run=False, verbose=False, force=False):
-    total = 0
-    embedded = 0
-    already_embedded = 0
-    skipped_with_lrc = 0
-    lrc_deleted = 0
-    folders = []
-
-    for dirpath, _, filenames in os.walk(root):
-        if any(f.lower().endswith(tuple(AUDIO_EXTS)) for f in filenames):
-            folders.append(dirpath)
-
-    for index, folder in enumerate(folders, 1):
-        letter, artist, album = describe_folder(folder)
-        console.print(f"\n[{index}/{len(folders)}] {letter} / {artist} / {album}", style="bold")
-
-        for file in sorted(os.listdir(folder)):
-            if not any(file.lower().endswith(ext) for ext in AUDIO_EXTS):
-                continue
-            total += 1
-            audio_path = os.path.join(folder, file)
-            lrc_path = find_lrc(audio_path)
-
-            has_embedded = has_embedded_lyrics(audio_path)
-            if has_embedded and not force:
-                already_embedded += 1
-                if lrc_path:
-                    skipped_with_lrc += 1
-                    # Delete .lrc file since lyrics are already embedded
-                    if not dry_run:
-                        try:
-                            os.remove(lrc_path)
-                            lrc_deleted += 1
-                            if verbose:
-                                console.print(f"[green]✓ Deleted .lrc (already embedded):[/green] {file}")
-                        except Exception as e:
-                            console.print(f"[red]Could not delete {lrc_path}: {e}[/red]")
-                    elif verbose:
-                        console.print(f"[yellow]Would delete .lrc (already embedded):[/yellow] {file}")
-                elif verbose:
-                    console.print(f"[cyan]– Already embedded:[/cyan] {file}")
-                continue
-
-            if lrc_path:
-                if has_embedded and force:
-                    if verbose:
-                        console.print(f"[yellow]Re-embedding (force mode):[/yellow] {file}")
-                success = embed_lyrics(audio_path, lrc_path, dry_run)
-                if success:
-                    embedded += 1
-                    if not dry_run:
-                        try:
-                            os.remove(lrc_path)
-                            lrc_deleted += 1
-                        except Exception as e:
-                            console.print(f"[red]Could not delete {lrc_path}: {e}[/red]")
+def iter_audio_folders(root):
+    """Yield (folder, audio file entries) for folders holding audio, as the walk reaches them."""
+    for dirpath, files in walk_entries(root):
+        audio = [e for e in files if os.path.splitext(e.name)[1].lower() in AUDIO_EXTS]
+        if audio:
+            yield dirpath, audio
+
+def process_audio_file(entry, dry_run=False, verbose=False, force=False):
+    """Embed or clean up one file's lyrics; returns (stat counts, lines to print). Safe to run in threads."""
+    stats = Counter(total=1)
+    lines = []
+    file = entry.name
+    audio_path = entry.path  # Already joined by scandir
+    lrc_path = find_lrc(audio_path)
+
+    # One tag parse per file, shared by the check and the write
+    tags = load_tags(audio_path, os.path.splitext(file)[1].lower())
+    has_embedded = has_embedded_lyrics(audio_path, tags)
+    if has_embedded and not force:
+        stats["already_embedded"] += 1
+        if lrc_path:
+            stats["skipped_with_lrc"] += 1
+            # Delete .lrc file since lyrics are already embedded
+            if not dry_run:
+                try:
+                    os.remove(lrc_path)
+                    stats["lrc_deleted"] += 1
                     if verbose:
-                        console.print(f"[green]✓ Embedded lyrics into:[/green] {file}")
-                else:
-                    console.print(f"[red]✗ Failed to embed:[/red] {file}")
+                        lines.append(f"[green]✓ Deleted .lrc (already embedded):[/green] {file}")
+                except Exception as e:
+                    lines.append(f"[red]Could not delete {lrc_path}: {e}[/red]")
             elif verbose:
-                console.print(f"[yellow]– No .lrc file found for:[/yellow] {file}")
-
-        lyrics_folder = os.path.join(folder, "Lyrics")
-        if os.path.isdir(lyrics_folder) and not os.listdir(lyrics_folder):
-            try:
-                if dry_run:
-                    console.print(f"[yellow]Would delete empty Lyrics folder:[/yellow] {lyrics_folder}")
-                else:
-                    os.rmdir(lyrics_folder)
-                    if verbose:
-                        console.print(f"[green]Deleted empty Lyrics folder:[/green] {lyrics_folder}")
-            except Exception as e:
-                console.print(f"[red]Could not remove Lyrics folder: {lyrics_folder} — {e}[/red]")
+                lines.append(f"[yellow]Would delete .lrc (already embedded):[/yellow] {file}")
+        elif verbose:
+            lines.append(f"[cyan]– Already embedded:[/cyan] {file}")
+        return stats, lines
+
+    if lrc_path:
+        if has_embedded and force:
+            if verbose:
+                lines.append(f"[yellow]Re-embedding (force mode):[/yellow] {file}")
+        success = embed_lyrics(audio_path, lrc_path, dry_run, tags)
+        if success:
+            stats["embedded"] += 1
+            if not dry_run:
+                try:
+                    os.remove(lrc_path)
+                    stats["lrc_deleted"] += 1
+                except Exception as e:
+                    lines.append(f"[red]Could not delete {lrc_path}: {e}[/red]")
+            if verbose:
+                lines.append(f"[green]✓ Embedded lyrics into:[/green] {file}")
+        else:
+            lines.append(f"[red]✗ Failed to embed:[/red] {file}")
+    elif verbose:
+        lines.append(f"[yellow]– No .lrc file found for:[/yellow] {file}")
+    return stats, lines
+
+def scan_archive(root, dry_run=False, verbose=False, force=False, workers=None):
+    if workers is None:
+        workers = default_workers(root, DEFAULT_WORKERS)
+    stats = Counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for index, (folder, entries) in enumerate(iter_audio_folders(root), 1):
+            letter, artist, album = describe_folder(folder)
+            console.print(f"\n[{index}] {letter} / {artist} / {album}", style="bold")
+
+            # Tag reads/writes are I/O bound: run the folder's files together. They're started in
+            # inode order, which roughly follows on-disk layout and saves seeks on spinning disks;
+            # the inode comes free with the directory listing.
+            entries.sort(key=lambda e: e.inode())
+            names = [e.name for e in entries]
+            results = dict(zip(names, executor.map(lambda e: process_audio_file(e, dry_run, verbose, force), entries)))
+            # Print in track order as a single block rather than one console.print per line
+            folder_lines = []
+            for name in sorted(names):
+                file_stats, lines = results[name]
+                stats.update(file_stats)
+                folder_lines.extend(lines)
+            if folder_lines:
+                console.print("\n".join(folder_lines))
+
+            lyrics_folder = os.path.join(folder, "Lyrics")
+            if os.path.isdir(lyrics_folder) and not os.listdir(lyrics_folder):
+                try:
+                    if dry_run:
+                        console.print(f"[yellow]Would delete empty Lyrics folder:[/yellow] {lyrics_folder}")
+                    else:
+                        os.rmdir(lyrics_folder)
+                        if verbose:
+                            console.print(f"[green]Deleted empty Lyrics folder:[/green] {lyrics_folder}")
+                except Exception as e:
+                    console.print(f"[red]Could not remove Lyrics folder: {lyrics_folder} — {e}[/red]")
 
     console.print("\n[bold underline]Summary[/bold underline]")
+    total = stats["total"]
     console.print(f"Audio files scanned: {total}")
-    console.print(f"Lyrics embedded: {embedded}")
-    console.print(f"Already embedded: {already_embedded}")
-    if skipped_with_lrc > 0:
-        console.print(f"Files with .lrc but already embedded: {skipped_with_lrc}")
-    console.print(f".lrc files deleted: {lrc_deleted}")
+    console.print(f"Lyrics embedded: {stats['embedded']}")
+    console.print(f"Already embedded: {stats['already_embedded']}")
+    if stats["skipped_with_lrc"] > 0:
+        console.print(f"Files with .lrc but already embedded: {stats['skipped_with_lrc']}")
+    console.print(f".lrc files deleted: {stats['lrc_deleted']}")
     console.print(f"Dry run: {'Yes' if dry_run else 'No'}")
     if total:
-        console.print(f"Success rate: {embedded / total * 100:.2f}%")
+        console.print(f"Success rate: {stats['embedded'] / total * 100:.2f}%")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Embed stripped .lrc lyrics into FLAC and MP3 files.")
@@ -159,5 +205,6 @@ if __name__ == "__main__":
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without modifying files")
     parser.add_argument("--verbose", action="store_true", help="Print detailed output per file")
     parser.add_argument("--force", action="store_true", help="Re-embed lyrics even if already embedded")
+    parser.add_argument("--workers", type=int, help=f"Files tagged in parallel (default: {DEFAULT_WORKERS}, {REMOTE_WORKERS} on network mounts)")
     args = parser.parse_args()
-    scan_archive(args.directory, args.dry_run, args.verbose, args.force)
\ No newline at end of file
+    scan_archive(args.directory, args.dry_run, args.verbose, args.force, args.workers)
\ No newline at end of file
@@ -12,208 +12,381 @@ import sys
 import argparse
 import subprocess
 import re
-from pathlib import Path
+import json
+import time
+import threading
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from urllib.parse import quote, urljoin
+import requests
+from bs4 import BeautifulSoup
+from mutagen.easyid3 import EasyID3
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3
+from mutagen.mp3 import MP3
+from requests.adapters import HTTPAdapter
 from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeRemainingColumn
+from rich.text import Text
+from urllib3.util.retry import Retry
+from utils.cache import CACHE_DIR, load_json_cache, save_json_cache
+from utils.output import capture_console
+from utils.walk import walk_entries
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:  # optional: falls back to BeautifulSoup's pure-Python parser
+    lxml = None
 
 console = Console()
 
+# Songs looked up at once; more than a handful and metal-archives starts refusing requests
+DEFAULT_WORKERS = 8
+
+AUDIO_EXTS = ('.flac', '.mp3', '.m4a', '.ogg', '.wav', '.aac')
+
+# Divs whose class or id mentions "lyrics", case-insensitively (XPath 1.0 has no lower()),
+# in one pass over the tree
+LYRICS_DIV_XPATH = ('//div[contains(translate(@class, "LYRICS", "lyrics"), "lyrics")'
+                    ' or contains(translate(@id, "LYRICS", "lyrics"), "lyrics")]')
+# Compiled once rather than re-parsed for every song page
+find_lyrics_divs = lxml.etree.XPath(LYRICS_DIV_XPATH) if lxml is not None else None
+LYRICS_HEADER_RE = re.compile(r'^lyrics:?\s*', re.IGNORECASE)
+# Characters dropped from a song title when it becomes the default .lrc filename
+UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+
+SITE_URL = 'https://www.metal-archives.com'
+# Statuses the site answers blocked Python clients with
+REFUSED_STATUSES = frozenset({403, 429})
+SEARCH_URL = SITE_URL + '/search/ajax-advanced/searching/songs/?bandName={band}&songTitle={title}'
+LYRICS_AJAX_URL = SITE_URL + '/release/ajax-view-lyrics/id/{song_id}'
+SONG_ID_RE = re.compile(r'/(?:lyrics|ajax-view-lyrics/id)/(\d+)')
+
+# Smallest file worth parsing: a FLAC needs its magic plus STREAMINFO, an MP3 a header and a frame
+MIN_AUDIO_BYTES = 512
+
+# Fetched lyrics allowed to wait on the writer thread before page fetches pause
+WRITE_QUEUE_SIZE = 64
+
+# Tag parsing is pure-Python CPU work, so it gets one process per core; below this many
+# files the pool's start-up costs more than it saves
+METADATA_WORKERS = os.cpu_count() or 1
+METADATA_POOL_MIN_FILES = 64
+
+# Search results and lyrics from earlier runs, so re-runs skip requests already answered
+CACHE_PATH = os.path.join(CACHE_DIR, 'metal_archives.json')
+# Artist/title per audio file, reused while the file's mtime and size are unchanged
+TAG_CACHE_PATH = os.path.join(CACHE_DIR, 'tags.json')
+# "Not found" answers are retried after this long, in case the song has been added since
+NEGATIVE_TTL = 30 * 24 * 60 * 60
+_MISS = object()
+# Output folders already made (or found) this run, so each mkdir happens once per folder
+_known_parents = set()
+
+
+@lru_cache(maxsize=4096)
+def build_search_url(band_name, song_title):
+    """The song search URL; cached since a library repeats the same band for every track."""
+    return SEARCH_URL.format(band=quote(band_name), title=quote(song_title))
+
+
 class MetalArchivesLyricsFetcher:
     """Fetcher for lyrics from Metal Archives."""
     
-    def __init__(self):
+    def __init__(self, pool_size=DEFAULT_WORKERS, cache=None):
+        # {'searches': {band\ttitle: entry}, 'lyrics': {song url: entry}}; entry = {'value', 'ts'}
+        self.cache = cache if cache is not None else {}
+        self.cache.setdefault('searches', {})
+        self.cache.setdefault('lyrics', {})
         self.session_headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
+        # The search and page pools each run pool_size threads, but together they may only have
+        # pool_size requests in flight, so the site sees no more clients than --workers
+        self._request_slots = threading.BoundedSemaphore(max(1, pool_size))
+        # One keep-alive session for every request, so each song doesn't pay a fresh
+        # DNS lookup and TCP/TLS handshake; sized to the requests allowed in flight
+        self.session = requests.Session()
+        self.session.headers.update(self.session_headers)
+        # 429 isn't retried: when the site throttles Python clients, curl gets through at once
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=retry))
+        # Set once the site refuses the session; from then on every request goes straight to curl
+        self._session_refused = False
+        # Searches currently running, so tracks sharing a band and title wait on one request
+        self._pending_searches = {}
+        self._pending_lock = threading.Lock()
     
-    def search_song(self, band_name, song_title):
-        """Search for a song on Metal Archives."""
-        try:
-            from bs4 import BeautifulSoup
-            
-            # Build search URL
-            search_url = f"https://www.metal-archives.com/search/ajax-advanced/searching/songs/?bandName={quote(band_name)}&songTitle={quote(song_title)}"
-            
-            # Use curl to fetch (works when Python requests are blocked)
+    def get_text(self, url):
+        """GET a page through the shared session, falling back to curl if the session is refused."""
+        with self._request_slots:
+            return self._get_text(url)
+    
+    def _get_text(self, url):
+        if not self._session_refused:
             try:
-                result = subprocess.run(
-                    ['curl', '-s', '-H', f'User-Agent: {self.session_headers["User-Agent"]}', search_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    import json
-                    data = json.loads(result.stdout)
+                response = self.session.get(url, timeout=10)
+                if response.status_code in REFUSED_STATUSES:
+                    self._session_refused = True
                 else:
-                    raise Exception("curl failed")
-            except Exception as e:
-                # Fallback to urllib
-                import urllib.request
-                import json
-                
-                req = urllib.request.Request(search_url)
-                req.add_header('User-Agent', self.session_headers['User-Agent'])
-                
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    data = json.loads(response.read().decode('utf-8'))
-            
-            aa_data = data.get('aaData', [])
-            if not aa_data or len(aa_data) == 0:
-                return None
-            
-            # Get first result
-            first_result = aa_data[0]
-            if not first_result or len(first_result) < 2:
-                return None
-            
-            # Parse the HTML result to get song URL
-            soup = BeautifulSoup(first_result[0], 'html.parser')
-            link = soup.find('a')
-            if not link:
-                return None
-            
-            song_url = link.get('href', '')
-            if not song_url.startswith('http'):
-                song_url = urljoin('https://www.metal-archives.com', song_url)
-            
+                    response.raise_for_status()
+                    return response.text
+            except requests.RequestException:
+                pass
+        # curl still gets through when Python clients are blocked
+        result = subprocess.run(
+            ['curl', '-s', '-f', '-H', f'User-Agent: {self.session_headers["User-Agent"]}', url],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        if result.returncode != 0:
+            raise requests.RequestException(f"curl exited with {result.returncode} for {url}")
+        return result.stdout
+    
+    def _cached(self, table, key):
+        """A cached answer (None for a recent "not found"), or _MISS if it has to be looked up."""
+        entry = self.cache[table].get(key)
+        if not isinstance(entry, dict):
+            return _MISS
+        value = entry.get('value')
+        if value is None and time.time() - entry.get('ts', 0) > NEGATIVE_TTL:
+            return _MISS
+        return value
+    
+    def _remember(self, table, key, value):
+        # Only definite answers land here; network errors are never cached
+        self.cache[table][key] = {'value': value, 'ts': int(time.time())}
+    
+    def search_song(self, band_name, song_title, out=console):
+        """Search for a song on Metal Archives."""
+        key = f"{band_name}\t{song_title}"
+        song_url = self._cached('searches', key)
+        if song_url is not _MISS:
             return song_url
-            
+        with self._pending_lock:
+            future = self._pending_searches.get(key)
+            owner = future is None
+            if owner:
+                # An owner that finished since the check above has remembered its answer by now
+                song_url = self._cached('searches', key)
+                if song_url is not _MISS:
+                    return song_url
+                self._pending_searches[key] = future = Future()
+        if not owner:
+            # Being searched for by another file's thread
+            return future.result()
+        song_url = None
+        try:
+            song_url = self._search_song(band_name, song_title)
+            self._remember('searches', key, song_url)
         except Exception as e:
-            console.print(f"[red]Error searching for song: {e}[/red]")
+            out.print(f"[red]Error searching for song: {e}[/red]")
+        finally:
+            future.set_result(song_url)
+            with self._pending_lock:
+                del self._pending_searches[key]
+        return song_url
+    
+    def _search_song(self, band_name, song_title):
+        """Look the song up; returns its URL or None, and raises on network errors."""
+        # Build search URL
+        search_url = build_search_url(band_name, song_title)
+        data = json.loads(self.get_text(search_url))
+        
+        aa_data = data.get('aaData', [])
+        if not aa_data or len(aa_data) == 0:
+            return None
+        
+        # Get first result
+        first_result = aa_data[0]
+        if not first_result or len(first_result) < 2:
+            return None
+        
+        # Parse the HTML result to get song URL
+        if lxml is not None:
+            link = next(lxml.html.fromstring(first_result[0]).iter('a'), None)
+        else:
+            link = BeautifulSoup(first_result[0], 'html.parser').find('a')
+        if link is None:
             return None
+        
+        song_url = link.get('href', '')
+        if not song_url.startswith('http'):
+            song_url = urljoin(SITE_URL, song_url)
+        
+        return song_url
     
-    def fetch_lyrics(self, song_url):
+    def fetch_lyrics(self, song_url, out=console):
         """Fetch lyrics from a song URL."""
-        try:
-            from bs4 import BeautifulSoup
-            
-            # Fetch song page
-            try:
-                result = subprocess.run(
-                    ['curl', '-s', '-H', f'User-Agent: {self.session_headers["User-Agent"]}', song_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    html = result.stdout
-                else:
-                    raise Exception("curl failed")
-            except Exception as e:
-                # Fallback to urllib
-                import urllib.request
-                
-                req = urllib.request.Request(song_url)
-                req.add_header('User-Agent', self.session_headers['User-Agent'])
-                
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    html = response.read().decode('utf-8')
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Find lyrics section
-            # Metal Archives typically has lyrics in a div with class "lyrics" or similar
-            lyrics_div = soup.find('div', class_=lambda x: x and 'lyrics' in str(x).lower())
-            if not lyrics_div:
-                # Try finding by id
-                lyrics_div = soup.find('div', id=lambda x: x and 'lyrics' in str(x).lower())
-            if not lyrics_div:
-                # Try finding any div containing "Lyrics" text
-                for div in soup.find_all('div'):
-                    if div.get_text() and 'lyrics' in div.get_text().lower()[:100]:
-                        lyrics_div = div
-                        break
-            
-            if not lyrics_div:
-                return None
-            
-            # Extract lyrics text
-            lyrics_text = lyrics_div.get_text(separator='\n', strip=True)
-            
-            # Clean up lyrics
-            # Remove "Lyrics:" header if present
-            lyrics_text = re.sub(r'^lyrics:?\s*', '', lyrics_text, flags=re.IGNORECASE)
-            lyrics_text = lyrics_text.strip()
-            
-            if not lyrics_text or len(lyrics_text) < 10:
-                return None
-            
+        lyrics_text = self._cached('lyrics', song_url)
+        if lyrics_text is not _MISS:
             return lyrics_text
-            
+        try:
+            lyrics_text = self._fetch_lyrics(song_url)
         except Exception as e:
-            console.print(f"[red]Error fetching lyrics: {e}[/red]")
+            out.print(f"[red]Error fetching lyrics: {e}[/red]")
+            return None
+        self._remember('lyrics', song_url, lyrics_text)
+        return lyrics_text
+    
+    def _fetch_lyrics(self, song_url):
+        """Fetch the song's lyrics; returns them or None, and raises on network errors."""
+        # The lyrics endpoint returns just the <br>-separated text, far smaller than the song page
+        match = SONG_ID_RE.search(song_url)
+        if match:
+            lyrics_text = self._clean_lyrics(self._lyrics_from_fragment(
+                self.get_text(LYRICS_AJAX_URL.format(song_id=match.group(1)))))
+            if lyrics_text is not None:
+                return lyrics_text
+        
+        # Fall back to scraping the song page
+        html = self.get_text(song_url)
+        
+        if lxml is not None:
+            lyrics_text = self._lyrics_from_tree(lxml.html.fromstring(html))
+        else:
+            lyrics_text = self._lyrics_from_soup(BeautifulSoup(html, 'html.parser'))
+        return self._clean_lyrics(lyrics_text)
+    
+    @staticmethod
+    def _clean_lyrics(lyrics_text):
+        """Strip a leading "Lyrics:" header; None when nothing usable is left."""
+        if lyrics_text is None:
+            return None
+        lyrics_text = LYRICS_HEADER_RE.sub('', lyrics_text).strip()
+        if not lyrics_text or len(lyrics_text) < 10 or 'lyrics not available' in lyrics_text.lower():
+            return None
+        return lyrics_text
+    
+    @staticmethod
+    def _lyrics_from_fragment(html):
+        """The text of a lyrics endpoint response, one stripped line per <br>-separated run."""
+        if not html.strip():
+            return None
+        if lxml is not None:
+            node = lxml.html.fragment_fromstring(html, create_parent='div')
+            return '\n'.join(text.strip() for text in node.itertext() if text.strip())
+        return BeautifulSoup(html, 'html.parser').get_text(separator='\n', strip=True)
+    
+    @staticmethod
+    def _lyrics_from_tree(tree):
+        """The lyrics section's text from an lxml tree, one stripped line per text node (None if absent)."""
+        # Metal Archives typically has lyrics in a div with class "lyrics" or similar, else by id;
+        # one query finds both, and a class match still wins over an earlier id match
+        nodes = find_lyrics_divs(tree)
+        if nodes:
+            node = next((div for div in nodes if 'lyrics' in (div.get('class') or '').lower()), nodes[0])
+        else:
+            # Last resort: any div whose text mentions lyrics near the start
+            node = next((div for div in tree.iter('div') if 'lyrics' in div.text_content().lower()[:100]), None)
+            if node is None:
+                return None
+        return '\n'.join(text.strip() for text in node.itertext() if text.strip())
+    
+    @staticmethod
+    def _lyrics_from_soup(soup):
+        """The same lookup on a BeautifulSoup tree, for when lxml isn't installed."""
+        lyrics_div = soup.find('div', class_=lambda x: x and 'lyrics' in str(x).lower())
+        if not lyrics_div:
+            # Try finding by id
+            lyrics_div = soup.find('div', id=lambda x: x and 'lyrics' in str(x).lower())
+        if not lyrics_div:
+            # Try finding any div containing "Lyrics" text
+            for div in soup.find_all('div'):
+                if div.get_text() and 'lyrics' in div.get_text().lower()[:100]:
+                    lyrics_div = div
+                    break
+        
+        if not lyrics_div:
             return None
+        
+        # Extract lyrics text
+        return lyrics_div.get_text(separator='\n', strip=True)
     
-    def save_lyrics(self, lyrics_text, output_path):
+    def save_lyrics(self, lyrics_text, output_path, out=console):
         """Save lyrics to a file."""
         try:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            parent = os.path.dirname(output_path)
+            if parent and parent not in _known_parents:
+                os.makedirs(parent, exist_ok=True)
+                _known_parents.add(parent)
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(lyrics_text)
             return True
         except Exception as e:
-            console.print(f"[red]Error saving lyrics: {e}[/red]")
+            out.print(f"[red]Error saving lyrics: {e}[/red]")
             return False
     
-    def fetch_and_save(self, band_name, song_title, output_path=None, dry_run=False):
-        """Fetch lyrics and save to file."""
-        console.print(f"\n[bold cyan]Searching for:[/bold cyan] {band_name} - {song_title}")
-        
-        # Search for song
-        song_url = self.search_song(band_name, song_title)
+    def fetch_and_save(self, band_name, song_title, output_path=None, dry_run=False, out=console):
+        """Fetch lyrics and save to file. Safe to call from several threads at once."""
+        song_url = self.find_song(band_name, song_title, out)
         if not song_url:
-            console.print(f"[red]✗ Song not found: {band_name} - {song_title}[/red]")
             return False
+        return self.save_song_lyrics(song_url, band_name, song_title, output_path, dry_run, out)
+    
+    def find_song(self, band_name, song_title, out=console):
+        """First stage: search for the song and report the result; returns its URL or None."""
+        out.print(f"\n[bold cyan]Searching for:[/bold cyan] {band_name} - {song_title}")
         
-        console.print(f"[green]✓ Found song URL:[/green] {song_url}")
+        # Search for song
+        song_url = self.search_song(band_name, song_title, out)
+        if not song_url:
+            out.print(f"[red]✗ Song not found: {band_name} - {song_title}[/red]")
+            return None
         
+        out.print(f"[green]✓ Found song URL:[/green] {song_url}")
+        return song_url
+    
+    def save_song_lyrics(self, song_url, band_name, song_title, output_path=None, dry_run=False, out=console):
+        """Second stage: fetch the found song's lyrics and save them."""
+        lyrics = self.download_lyrics(song_url, band_name, song_title, out)
+        if lyrics is None:
+            return False
+        return self.store_lyrics(lyrics, output_path, dry_run, out)
+    
+    def download_lyrics(self, song_url, band_name, song_title, out=console):
+        """Fetch the found song's lyrics, reporting a miss; returns the text or None."""
         # Fetch lyrics
-        lyrics = self.fetch_lyrics(song_url)
+        lyrics = self.fetch_lyrics(song_url, out)
         if not lyrics:
-            console.print(f"[red]✗ Lyrics not found for: {band_name} - {song_title}[/red]")
-            return False
-        
+            out.print(f"[red]✗ Lyrics not found for: {band_name} - {song_title}[/red]")
+            return None
+        return lyrics
+    
+    def store_lyrics(self, lyrics, output_path, dry_run=False, out=console):
+        """Save fetched lyrics (or preview them in a dry run) and report the result."""
         if dry_run:
-            console.print(f"[yellow]Would save lyrics to:[/yellow] {output_path}")
-            console.print(f"[dim]{lyrics[:200]}...[/dim]")
+            out.print(f"[yellow]Would save lyrics to:[/yellow] {output_path}")
+            out.print(f"[dim]{lyrics[:200]}...[/dim]")
             return True
         
         # Save lyrics
-        if self.save_lyrics(lyrics, output_path):
-            console.print(f"[green]✓ Lyrics saved to:[/green] {output_path}")
+        if self.save_lyrics(lyrics, output_path, out):
+            out.print(f"[green]✓ Lyrics saved to:[/green] {output_path}")
             return True
         else:
             return False
 
-
 def find_audio_files(directory):
-    """Find all audio files in a directory."""
-    audio_exts = ['.flac', '.mp3', '.m4a', '.ogg', '.wav', '.aac']
-    audio_files = []
-    
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in audio_exts):
-                audio_files.append(Path(root) / file)
-    
-    return audio_files
+    """Yield the path (a plain string) of every audio file in a directory, as the walk finds them."""
+    for _, files in walk_entries(directory):
+        for entry in files:
+            # endswith takes the whole tuple, so the suffix match is one C-level call
+            if entry.name.lower().endswith(AUDIO_EXTS):
+                yield entry.path
 
 
 def extract_metadata(audio_path):
     """Extract artist and title from audio file."""
     try:
-        from mutagen.flac import FLAC
-        from mutagen.id3 import ID3, EasyID3
-        from mutagen.mp3 import MP3
-        
-        if audio_path.suffix.lower() == '.flac':
+        ext = os.path.splitext(audio_path)[1].lower()
+        if ext == '.flac':
             audio = FLAC(audio_path)
             artist = audio.get('artist', ['Unknown'])[0]
             title = audio.get('title', ['Unknown'])[0]
-        elif audio_path.suffix.lower() == '.mp3':
+        elif ext == '.mp3':
             try:
                 easy = EasyID3(audio_path)
                 artist = easy.get('artist', ['Unknown'])[0]
@@ -230,51 +403,187 @@ def extract_metadata(audio_path):
         return None, None
 
 
-def process_directory(directory, dry_run=False, verbose=False):
+def extract_all_metadata(audio_files, tag_cache=None):
+    """(artist, title) for each file, in order; tag_cache ({path: [mtime_ns, size, artist, title]}) is consulted and updated."""
+    if tag_cache is None:
+        tag_cache = {}
+    results = [None] * len(audio_files)
+    misses = []
+    for index, audio_file in enumerate(audio_files):
+        key = audio_file
+        try:
+            st = os.stat(key)
+        except OSError:
+            results[index] = (None, None)
+            continue
+        if st.st_size < MIN_AUDIO_BYTES:
+            # Zero-byte or truncated download: mutagen would only raise on it
+            results[index] = (None, None)
+            continue
+        entry = tag_cache.get(key)
+        if isinstance(entry, list) and len(entry) == 4 and entry[:2] == [st.st_mtime_ns, st.st_size]:
+            results[index] = (entry[2], entry[3])
+        else:
+            misses.append((index, key, st))
+    
+    # Only files that changed since the last run get parsed, in parallel when there are many
+    paths = [audio_files[index] for index, _, _ in misses]
+    if len(paths) >= METADATA_POOL_MIN_FILES and METADATA_WORKERS > 1:
+        with ProcessPoolExecutor(max_workers=METADATA_WORKERS) as pool:
+            parsed = list(pool.map(extract_metadata, paths, chunksize=32))
+    else:
+        parsed = [extract_metadata(path) for path in paths]
+    
+    for (index, key, st), (artist, title) in zip(misses, parsed):
+        results[index] = (artist, title)
+        # Failed reads aren't cached, so a file that couldn't be parsed is retried next run
+        if artist is not None and title is not None:
+            tag_cache[key] = [st.st_mtime_ns, st.st_size, artist, title]
+    return results
+
+
+def process_directory(directory, dry_run=False, verbose=False, workers=DEFAULT_WORKERS, fetcher=None, tag_cache=None, force=False):
     """Process all audio files in a directory and fetch lyrics."""
-    directory = Path(directory)
-    if not directory.exists():
+    if not os.path.exists(directory):
         console.print(f"[red]Error: Directory does not exist: {directory}[/red]")
         return
     
-    audio_files = find_audio_files(directory)
+    audio_files = list(find_audio_files(directory))
     if not audio_files:
         console.print(f"[yellow]No audio files found in: {directory}[/yellow]")
         return
     
     console.print(f"\n[bold cyan]Found {len(audio_files)} audio files[/bold cyan]")
     
-    fetcher = MetalArchivesLyricsFetcher()
+    if fetcher is None:
+        fetcher = MetalArchivesLyricsFetcher(pool_size=workers)
     fetched = 0
     skipped = 0
     failed = 0
+    songs = []
+    
+    # Drop tracks that already have a .lrc before reading any tags; on incremental runs
+    # that's most of the library. Paths stay plain strings throughout: no per-file Path objects
+    if force:
+        pending = audio_files
+    else:
+        pending = []
+        for audio_file in audio_files:
+            if os.path.exists(os.path.splitext(audio_file)[0] + '.lrc'):
+                if verbose:
+                    console.print(f"[cyan]Skipping {os.path.basename(audio_file)}: .lrc already exists[/cyan]")
+            else:
+                pending.append(audio_file)
+    skipped_existing = len(audio_files) - len(pending)
+    skipped += skipped_existing
+    
+    # Extract metadata (cached per file, parsed in parallel on big directories)
+    metadata = extract_all_metadata(pending, tag_cache)
     
-    for audio_file in audio_files:
-        # Extract metadata
-        artist, title = extract_metadata(audio_file)
+    for audio_file, (artist, title) in zip(pending, metadata):
         if not artist or not title or artist == 'Unknown' or title == 'Unknown':
             if verbose:
-                console.print(f"[yellow]Skipping {audio_file.name}: missing metadata[/yellow]")
+                console.print(f"[yellow]Skipping {os.path.basename(audio_file)}: missing metadata[/yellow]")
             skipped += 1
             continue
         
-        # Check if .lrc already exists
-        lrc_path = audio_file.with_suffix('.lrc')
-        if lrc_path.exists():
-            if verbose:
-                console.print(f"[cyan]Skipping {audio_file.name}: .lrc already exists[/cyan]")
-            skipped += 1
-            continue
+        songs.append((artist, title, os.path.splitext(audio_file)[0] + '.lrc'))
+    
+    # Lookups mostly wait on the network, so run several at once, as a two-stage pipeline:
+    # searches in one pool, and each found song's page fetch handed to a second pool as soon
+    # as its search returns, so a slow stage never leaves the other idle. Saving is handed on
+    # again to a single writer thread, so a slow disk doesn't hold up page fetches; at most
+    # WRITE_QUEUE_SIZE saves wait at once, after which page fetches block until one is done.
+    # Every song renders into its own buffer; a single progress bar tracks the run, and a song's
+    # buffer is only printed (in order, above the bar) if it failed, or with --verbose/--dry-run.
+    write_slots = threading.BoundedSemaphore(WRITE_QUEUE_SIZE)
+    show_all = verbose or dry_run
+    
+    def finished(ok, buffer):
+        progress.advance(task)
+        done = Future()
+        done.set_result((ok, buffer.file.getvalue()))
+        return done
+    
+    def search(song):
+        artist, title, _ = song
+        buffer = capture_console(console)
+        return fetcher.find_song(artist, title, buffer), buffer
+    
+    def fetch(song, song_url, buffer):
+        artist, title, lrc_path = song
+        lyrics = fetcher.download_lyrics(song_url, artist, title, buffer)
+        if lyrics is None:
+            return finished(False, buffer)
+        if dry_run:
+            return finished(fetcher.store_lyrics(lyrics, lrc_path, True, buffer), buffer)
+        write_slots.acquire()
+        return writer.submit(write, lyrics, lrc_path, buffer)
+    
+    def write(lyrics, lrc_path, buffer):
+        try:
+            return fetcher.store_lyrics(lyrics, lrc_path, False, buffer), buffer.file.getvalue()
+        finally:
+            write_slots.release()
+            progress.advance(task)
+    
+    def outcome(page):
+        """A page future's final (ok, output), or None while it or its save is still running."""
+        if not page.done():
+            return None
+        result = page.result()
+        if isinstance(result, Future):
+            return result.result() if result.done() else None
+        return result
+    
+    pool_size = max(1, workers)
+    with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeRemainingColumn(),
+            console=console
+    ) as progress, \
+            ThreadPoolExecutor(max_workers=pool_size) as search_pool, \
+            ThreadPoolExecutor(max_workers=pool_size) as page_pool, \
+            ThreadPoolExecutor(max_workers=1) as writer:
+        task = progress.add_task("Fetching lyrics", total=len(songs))
+        searches = {search_pool.submit(search, song): index for index, song in enumerate(songs)}
+        pages = [None] * len(songs)
+        printed = 0
         
-        # Fetch lyrics
-        if fetcher.fetch_and_save(artist, title, lrc_path, dry_run):
-            fetched += 1
-        else:
-            failed += 1
+        def print_ready(block=False):
+            nonlocal printed, fetched, failed
+            while printed < len(pages) and pages[printed] is not None:
+                if block:
+                    result = pages[printed].result()
+                    ok, output = result.result() if isinstance(result, Future) else result
+                else:
+                    ready = outcome(pages[printed])
+                    if ready is None:
+                        break
+                    ok, output = ready
+                if show_all or not ok:
+                    # The buffer is already rendered; print it through the console so it lands above the bar
+                    console.print(Text.from_ansi(output.rstrip('\n')))
+                if ok:
+                    fetched += 1
+                else:
+                    failed += 1
+                printed += 1
+        
+        for future in as_completed(searches):
+            index = searches[future]
+            song_url, buffer = future.result()
+            pages[index] = page_pool.submit(fetch, songs[index], song_url, buffer) if song_url else finished(False, buffer)
+            print_ready()
+        print_ready(block=True)
     
     console.print(f"\n[bold underline]Summary[/bold underline]")
     console.print(f"Lyrics fetched: {fetched}")
     console.print(f"Skipped: {skipped}")
+    console.print(f"Already had .lrc: {skipped_existing}")
     console.print(f"Failed: {failed}")
     console.print(f"Dry run: {'Yes' if dry_run else 'No'}")
 
@@ -325,27 +634,50 @@ Examples:
         action='store_true',
         help='Print detailed output'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Songs fetched in parallel with -d (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='With -d, re-fetch lyrics even for tracks that already have a .lrc'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Ignore and don\'t update the lookup and tag caches (in {CACHE_DIR})'
+    )
     
     args = parser.parse_args()
     
-    fetcher = MetalArchivesLyricsFetcher()
+    cache = {} if args.no_cache else load_json_cache(CACHE_PATH)
+    tag_cache = {} if args.no_cache else load_json_cache(TAG_CACHE_PATH)
+    fetcher = MetalArchivesLyricsFetcher(pool_size=args.workers, cache=cache)
     
     if args.directory:
         # Process directory
-        process_directory(args.directory, args.dry_run, args.verbose)
+        process_directory(args.directory, args.dry_run, args.verbose, args.workers, fetcher, tag_cache, args.force)
     elif args.band_name and args.song_title:
         # Fetch single song
         if args.output:
-            output_path = Path(args.output)
+            output_path = args.output
         else:
             # Default: save as song_title.lrc in current directory
-            safe_title = re.sub(r'[^\w\s-]', '', args.song_title).strip()
-            output_path = Path(f"{safe_title}.lrc")
+            safe_title = UNSAFE_FILENAME_RE.sub('', args.song_title).strip()
+            output_path = f"{safe_title}.lrc"
         
         fetcher.fetch_and_save(args.band_name, args.song_title, output_path, args.dry_run)
     else:
         parser.print_help()
         sys.exit(1)
+    
+    if not args.no_cache:
+        save_json_cache(fetcher.cache, CACHE_PATH)
+        if args.directory:
+            save_json_cache(tag_cache, TAG_CACHE_PATH)
 
 
 if __name__ == '__main__':
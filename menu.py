@@ -6,7 +6,9 @@ Interactive menu for running music library management tools.
 import os
 import sys
 import subprocess
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
@@ -18,93 +20,46 @@ console = Console()
 SCRIPT_DIR = Path(__file__).parent
 
 # Frequent scripts with their descriptions and argument patterns
-FREQUENT_SCRIPTS = {
-    "1": {
-        "name": "lyrics_embed_from_lrc.py",
-        "description": "Embed lyrics from .lrc files into audio files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--verbose", "--force"]
-    },
-    "2": {
-        "name": "cover_extract_embedded.py",
-        "description": "Extract embedded cover art from audio files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run"]
-    },
-    "3": {
-        "name": "cover_normalize_format.py",
-        "description": "Normalize cover art formats (PNG to JPG, rename patterns)",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run"]
-    },
-    "4": {
-        "name": "cover_normalize_case.py",
-        "description": "Standardize cover art filenames to lowercase",
-        "arg_pattern": "--archive",
-        "common_flags": ["--dry-run"]
-    },
-    "5": {
-        "name": "cover_fetch_highres.py",
-        "description": "Fetch high-resolution cover art using COVIT",
-        "arg_pattern": "-d",  # Also accepts --archive
-        "common_flags": ["--dry-run"]
-    },
-    "6": {
-        "name": "folder_remove_empty.py",
-        "description": "Remove empty folders without audio files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--verbose"]
-    },
-    "7": {
-        "name": "folder_remove_cover_only.py",
-        "description": "Remove folders that are empty or only contain cover images",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--verbose", "--delete-covers"]
-    },
-    "8": {
-        "name": "archive_lossy_duplicates.py",
-        "description": "Archive various lossy format duplicates (MP3, AAC, OGG, etc.)",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--format", "--keep"]
-    },
-    "9": {
-        "name": "archive_mp3_duplicates.py",
-        "description": "Archive MP3 duplicates of FLAC files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--format", "--keep", "--verbose"]
-    },
-    "10": {
-        "name": "track_validate_numbering.py",
-        "description": "Validate track numbering and detect gaps",
-        "arg_pattern": "--archive",
-        "common_flags": ["--strict"]
-    },
-    "11": {
-        "name": "metadata_generate_nfo.py",
-        "description": "Generate album.nfo and artist.nfo documentation files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--verbose"]
-    },
-    "12": {
-        "name": "lyrics_fetch_metal_archives.py",
-        "description": "Fetch lyrics from Metal Archives and save as .lrc files",
-        "arg_pattern": "-d",
-        "common_flags": ["--dry-run", "--verbose"]
-    }
-}
+class Script(NamedTuple):
+    id: str
+    name: str
+    description: str
+    arg_pattern: str
+    common_flags: Tuple[str, ...]
 
-def show_menu():
-    """Display the main menu."""
+# Built once in menu order; SCRIPTS_BY_ID is for looking up a selection
+SCRIPTS = (
+    Script("1", "lyrics_embed_from_lrc.py", "Embed lyrics from .lrc files into audio files", "-d", ("--dry-run", "--verbose", "--force")),
+    Script("2", "cover_extract_embedded.py", "Extract embedded cover art from audio files", "-d", ("--dry-run",)),
+    Script("3", "cover_normalize_format.py", "Normalize cover art formats (PNG to JPG, rename patterns)", "-d", ("--dry-run",)),
+    Script("4", "cover_normalize_case.py", "Standardize cover art filenames to lowercase", "--archive", ("--dry-run",)),
+    Script("5", "cover_fetch_highres.py", "Fetch high-resolution cover art using COVIT", "-d", ("--dry-run",)),  # Also accepts --archive
+    Script("6", "folder_remove_empty.py", "Remove empty folders without audio files", "-d", ("--dry-run", "--verbose")),
+    Script("7", "folder_remove_cover_only.py", "Remove folders that are empty or only contain cover images", "-d", ("--dry-run", "--verbose", "--delete-covers")),
+    Script("8", "archive_lossy_duplicates.py", "Archive various lossy format duplicates (MP3, AAC, OGG, etc.)", "-d", ("--dry-run", "--format", "--keep")),
+    Script("9", "archive_mp3_duplicates.py", "Archive MP3 duplicates of FLAC files", "-d", ("--dry-run", "--format", "--keep", "--verbose")),
+    Script("10", "track_validate_numbering.py", "Validate track numbering and detect gaps", "--archive", ("--strict",)),
+    Script("11", "metadata_generate_nfo.py", "Generate album.nfo and artist.nfo documentation files", "-d", ("--dry-run", "--verbose", "--gap-report")),
+    Script("12", "lyrics_fetch_metal_archives.py", "Fetch lyrics from Metal Archives and save as .lrc files", "-d", ("--dry-run", "--verbose")),
+)
+SCRIPTS_BY_ID = {script.id: script for script in SCRIPTS}
+
+@lru_cache(maxsize=None)
+def build_menu_table():
+    """Build the menu table once; every redraw prints the same object."""
     table = Table(title="Music Library Management Tools", show_header=True, header_style="bold magenta")
     table.add_column("ID", style="cyan", width=4)
     table.add_column("Script", style="green", width=25)
     table.add_column("Description", style="white", width=60)
     
-    for key, script in sorted(FREQUENT_SCRIPTS.items(), key=lambda x: int(x[0])):
-        table.add_row(key, script["name"], script["description"])
-    
+    for script in SCRIPTS:
+        table.add_row(script.id, script.name, script.description)
+    return table
+
+def show_menu():
+    """Display the main menu."""
     console.print()
-    console.print(table)
+    console.print(build_menu_table())
     console.print()
 
 def get_music_directory():
@@ -127,7 +82,7 @@ def get_music_directory():
 
 def build_command(script_info, directory, dry_run=True, extra_args=None):
     """Build the command to run a script."""
-    script_path = SCRIPT_DIR / script_info["name"]
+    script_path = SCRIPT_DIR / script_info.name
     
     if not script_path.exists():
         console.print(f"[red]Error: Script not found: {script_path}[/red]")
@@ -136,9 +91,9 @@ def build_command(script_info, directory, dry_run=True, extra_args=None):
     cmd = [sys.executable, str(script_path)]
     
     # Add directory argument
-    if script_info["arg_pattern"] == "-d":
+    if script_info.arg_pattern == "-d":
         cmd.extend(["-d", directory])
-    elif script_info["arg_pattern"] == "--archive":
+    elif script_info.arg_pattern == "--archive":
         cmd.extend(["--archive", directory])
     
     # Add dry-run if requested
@@ -153,14 +108,13 @@ def build_command(script_info, directory, dry_run=True, extra_args=None):
 
 def run_script(script_key):
     """Run a selected script."""
-    if script_key not in FREQUENT_SCRIPTS:
+    script_info = SCRIPTS_BY_ID.get(script_key)
+    if script_info is None:
         console.print(f"[red]Invalid selection: {script_key}[/red]")
         return
     
-    script_info = FREQUENT_SCRIPTS[script_key]
-    
-    console.print(f"\n[bold green]Selected: {script_info['name']}[/bold green]")
-    console.print(f"[dim]{script_info['description']}[/dim]\n")
+    console.print(f"\n[bold green]Selected: {script_info.name}[/bold green]")
+    console.print(f"[dim]{script_info.description}[/dim]\n")
     
     # Get music directory
     directory = get_music_directory()
@@ -176,7 +130,7 @@ def run_script(script_key):
     if script_key in ["8", "9"]:  # Archive scripts
         format_choice = Prompt.ask(
             "Archive format",
-            choices=["7z", "zip", "tar.gz", "tar.xz", "tar.bz2", "gzip", "bzip2", "xz"],
+            choices=["7z", "zip", "tar.gz", "tar.xz", "tar.bz2", "tar.zst", "gzip", "bzip2", "xz"],
             default="tar.xz"
         )
         extra_args.extend(["--format", format_choice])
@@ -203,6 +157,11 @@ def run_script(script_key):
         if delete_covers:
             extra_args.append("--delete-covers")
     
+    if script_key == "11":  # nfo_generate
+        gap_report = Confirm.ask("Also print the track gap report (same scan)?", default=False)
+        if gap_report:
+            extra_args.append("--gap-report")
+    
     if script_key == "10":  # track_gap_checker
         strict = Confirm.ask("Use strict mode (flag albums not starting at 01)?", default=False)
         if strict:
@@ -221,13 +180,13 @@ def run_script(script_key):
         return
     
     # Run the script
-    console.print(f"\n[bold cyan]Running {script_info['name']}...[/bold cyan]\n")
+    console.print(f"\n[bold cyan]Running {script_info.name}...[/bold cyan]\n")
     try:
         result = subprocess.run(cmd, check=False)
         if result.returncode == 0:
-            console.print(f"\n[bold green]✓ {script_info['name']} completed successfully[/bold green]")
+            console.print(f"\n[bold green]✓ {script_info.name} completed successfully[/bold green]")
         else:
-            console.print(f"\n[bold red]✗ {script_info['name']} exited with code {result.returncode}[/bold red]")
+            console.print(f"\n[bold red]✗ {script_info.name} exited with code {result.returncode}[/bold red]")
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted by user[/yellow]")
     except Exception as e:
@@ -258,7 +217,7 @@ def main():
             console.print("  • metadata_normalize_multi_artist.py - Normalize multi-artist tags")
             console.print("  • band-photo-logo/ - Metal Archives scraper")
             console.print("\n[dim]These scripts are in the 'archive' folder and can be run directly if needed.[/dim]\n")
-        elif choice in FREQUENT_SCRIPTS:
+        elif choice in SCRIPTS_BY_ID:
             run_script(choice)
             if not Confirm.ask("\nRun another script?", default=True):
                 break
@@ -1,16 +1,51 @@
 import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from mutagen.flac import FLAC
 from mutagen.id3 import ID3, ID3NoHeaderError, USLT, APIC
 from mutagen.mp3 import MP3
-from mutagen.easyid3 import EasyID3
 from rich.console import Console
+from track_validate_numbering import TrackGapChecker, print_report
+from utils.walk import walk_entries
 
 console = Console()
+# Tag parsing is CPU-bound Python, so album folders get one process per core
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Each .nfo is formatted whole and written in one call
+ALBUM_NFO_TEMPLATE = (
+    "# Album: {album} ({year})\n"
+    "**Artist:** {artist}\n"
+    "**Genre:** {genre}\n"
+    "**Format:** {format}\n"
+    "**Cover:** {cover}\n"
+    "**Lyrics:** {lyrics_mark}\n"
+)
+ARTIST_NFO_TEMPLATE = (
+    "# Artist: {artist}\n"
+    "**Genre:** {genre}\n"
+    "**Origin:** Unknown\n"
+    "**Years Active:** Unknown\n"
+    "**MusicBrainz ID:** Unknown\n"
+    "\n### Biography:\nThis artist.nfo was generated from embedded metadata. Web enrichment coming soon.\n"
+)
 
 def is_valid_audio(filename):
     return filename.lower().endswith((".flac", ".mp3")) and not filename.startswith("._")
 
+def id3_text(tags, frame_id):
+    """First value of an ID3 text frame as EasyID3 would report it, from tags already parsed."""
+    frame = tags.get(frame_id)
+    if frame is None:
+        return "Unknown"
+    if frame_id == "TCON":
+        values = frame.genres
+    elif frame_id == "TDRC":
+        values = [stamp.text for stamp in frame.text]
+    else:
+        values = list(frame.text)
+    return values[0] if values else "Unknown"
+
 def extract_metadata(audio_path):
     metadata = {
         "artist": "Unknown",
@@ -39,12 +74,13 @@ def extract_metadata(audio_path):
 
         elif audio_path.lower().endswith(".mp3"):
             audio = MP3(audio_path, ID3=ID3)
-            easy = EasyID3(audio_path)
+            if audio.tags is None:
+                raise ID3NoHeaderError(f"{audio_path!r} doesn't start with an ID3 tag")
             metadata.update({
-                "artist": easy.get("artist", ["Unknown"])[0],
-                "album": easy.get("album", ["Unknown"])[0],
-                "year": easy.get("date", ["Unknown"])[0],
-                "genre": easy.get("genre", ["Unknown"])[0],
+                "artist": id3_text(audio.tags, "TPE1"),
+                "album": id3_text(audio.tags, "TALB"),
+                "year": id3_text(audio.tags, "TDRC"),
+                "genre": id3_text(audio.tags, "TCON"),
                 "lyrics": any(isinstance(tag, USLT) for tag in audio.tags.values())
             })
             for tag in audio.tags.values():
@@ -63,12 +99,7 @@ def write_album_nfo(folder, metadata, dry_run=False):
         console.print(f"[yellow]Would write album.nfo in {folder}[/yellow]")
         return
     with open(path, "w", encoding="utf-8") as f:
-        f.write(f"# Album: {metadata['album']} ({metadata['year']})\n")
-        f.write(f"**Artist:** {metadata['artist']}\n")
-        f.write(f"**Genre:** {metadata['genre']}\n")
-        f.write(f"**Format:** {metadata['format']}\n")
-        f.write(f"**Cover:** {metadata['cover']}\n")
-        f.write(f"**Lyrics:** {'✅' if metadata['lyrics'] else '❌'}\n")
+        f.write(ALBUM_NFO_TEMPLATE.format(**metadata, lyrics_mark="✅" if metadata["lyrics"] else "❌"))
 
 def write_artist_nfo(folder, metadata, dry_run=False):
     path = os.path.join(folder, "artist.nfo")
@@ -76,31 +107,45 @@ def write_artist_nfo(folder, metadata, dry_run=False):
         console.print(f"[yellow]Would write artist.nfo in {folder}[/yellow]")
         return
     with open(path, "w", encoding="utf-8") as f:
-        f.write(f"# Artist: {metadata['artist']}\n")
-        f.write(f"**Genre:** {metadata['genre']}\n")
-        f.write(f"**Origin:** Unknown\n")
-        f.write(f"**Years Active:** Unknown\n")
-        f.write(f"**MusicBrainz ID:** Unknown\n")
-        f.write("\n### Biography:\nThis artist.nfo was generated from embedded metadata. Web enrichment coming soon.\n")
-
-def process_album_folder(folder, dry_run=False, verbose=False):
-    for filename in sorted(os.listdir(folder)):
-        if is_valid_audio(filename):
-            audio_path = os.path.join(folder, filename)
-            metadata = extract_metadata(audio_path)
-            write_album_nfo(folder, metadata, dry_run)
-            write_artist_nfo(folder, metadata, dry_run)
-            if verbose:
-                console.print(f"[green]📝 Generated .nfo files for:[/green] {folder}")
-            return True
-    return False
-
-def scan_archive(root_path, dry_run=False, verbose=False):
+        f.write(ARTIST_NFO_TEMPLATE.format(**metadata))
+
+def iter_album_folders(root, walk=None):
+    """Yield (folder, audio file entries) for folders holding audio, as the walk (or a collected ``walk``) reaches them."""
+    for dirpath, files in walk if walk is not None else walk_entries(root):
+        audio = [e for e in files if is_valid_audio(e.name)]
+        if audio:
+            yield dirpath, audio
+
+def generate_nfos(folder, audio_path, dry_run=False, verbose=False):
+    metadata = extract_metadata(audio_path)
+    write_album_nfo(folder, metadata, dry_run)
+    write_artist_nfo(folder, metadata, dry_run)
+    if verbose:
+        console.print(f"[green]📝 Generated .nfo files for:[/green] {folder}")
+
+def generate_nfos_captured(job):
+    """Run generate_nfos in a worker process and return its console output for the parent to print in order."""
+    with console.capture() as capture:
+        generate_nfos(*job)
+    return capture.get()
+
+def first_audio(entries):
+    """Alphabetically first audio entry, or None; a single pass rather than sorting the folder."""
+    return min(entries, key=lambda e: e.name, default=None)
+
+def scan_archive(root_path, dry_run=False, verbose=False, workers=DEFAULT_WORKERS, walk=None):
+    # DirEntry objects don't pickle, so workers get the folder and its chosen track as plain paths
+    jobs = [(dirpath, first_audio(audio).path, dry_run, verbose) for dirpath, audio in iter_album_folders(root_path, walk)]
     processed = 0
-    for dirpath, _, filenames in os.walk(root_path):
-        if any(is_valid_audio(f) for f in filenames):
-            if process_album_folder(dirpath, dry_run, verbose):
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for output in pool.map(generate_nfos_captured, jobs, chunksize=8):
+                print(output, end="")
                 processed += 1
+    else:
+        for job in jobs:
+            generate_nfos(*job)
+            processed += 1
 
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Album folders processed: {processed}")
@@ -111,5 +156,12 @@ if __name__ == "__main__":
     parser.add_argument("-d", "--directory", required=True, help="Root directory to scan")
     parser.add_argument("--dry-run", action="store_true", help="Preview actions without writing files")
     parser.add_argument("--verbose", action="store_true", help="Print detailed output per folder")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Parallel album folder processes (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--gap-report", action="store_true", help="Also print the track gap report, reusing the same directory walk")
     args = parser.parse_args()
-    scan_archive(args.directory, args.dry_run, args.verbose)
\ No newline at end of file
+    # Both passes read one collected walk, so the archive is only traversed once
+    collected_walk = list(walk_entries(args.directory)) if args.gap_report else None
+    scan_archive(args.directory, args.dry_run, args.verbose, args.workers, collected_walk)
+    if args.gap_report:
+        print()
+        print_report(TrackGapChecker(args.directory).scan_archive(collected_walk), args.directory, strict_mode=False)
\ No newline at end of file
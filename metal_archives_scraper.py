@@ -10,95 +10,282 @@ Uses direct Metal Archives API access.
 import os
 import sys
 import argparse
+import io
+import json
+import re
+import shutil
+import subprocess
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 import requests
-from PIL import Image
-import io
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.cache import CACHE_DIR, load_json_cache, save_json_cache
+from utils.walk import walk_entries
+
+try:
+    import lxml.html
+except ImportError:  # optional: falls back to BeautifulSoup's pure-Python parser
+    lxml = None
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+# BeautifulSoup's builder for the search-result snippets: lxml's C parser when it's there
+SOUP_PARSER = 'lxml' if lxml is not None else 'html.parser'
+
+# Metal Archives serves UTF-8; pages are parsed from bytes with it rather than sniffed
+PAGE_ENCODING = 'utf-8'
 
 # Note: We use direct Metal Archives API access (same approach as Script Kit scripts)
 # This works better than enmet for avoiding blocking issues
 
+# Bands looked up concurrently by --all
+DEFAULT_WORKERS = 8
+# Candidate discography pages fetched at once while matching a band, shared by all bands
+DISCOGRAPHY_WORKERS = 8
+# Image downloads in flight at once: a logo and a photo for each concurrent band
+DOWNLOAD_WORKERS = 2 * DEFAULT_WORKERS
+# Requests open against Metal Archives at once across every pool, however many bands
+# run concurrently; it blocks clients that hammer it
+MAX_IN_FLIGHT_REQUESTS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# A name's last-dot suffix is looked up here, so each filename is lowercased only from the dot
+AUDIO_EXTS = frozenset(('.mp3', '.flac', '.m4a', '.wav', '.ogg', '.aac'))
+# Everything up to the last " - " ("Year - Album") and from the first " (" on ("(Year)" or
+# "(Type)"), dropped from an album folder name in one pass
+ALBUM_FOLDER_NOISE_RE = re.compile(r'^(?:.*? - )*| \(.*$', re.DOTALL)
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# Validators of downloaded images and each band folder's matched band, kept between runs
+CACHE_PATH = os.path.join(CACHE_DIR, 'metal_archives_scraper.json')
+# Bumped whenever the cache layout changes
+CACHE_VERSION = 1
+
+# The discography table by id, else by a class mentioning it; XPath 1.0 has no lower()
+DISCOGRAPHY_ID_XPATH = '//table[@id="discography"]'
+DISCOGRAPHY_CLASS_XPATH = '//table[contains(translate(@class, "DISCOGRAPHY", "discography"), "discography")]'
+# A band page URL ends in the band's numeric id, which names its discography tab
+BAND_ID_RE = re.compile(r'/(\d+)/?$')
+DISCOGRAPHY_TAB_URL = 'https://www.metal-archives.com/band/discography/id/{band_id}/tab/all'
+
+# Logo and photo URLs straight from the band page bytes (same approach as Script Kit
+# scripts), tried in order
+LOGO_PATTERNS = tuple(re.compile(pattern.encode(), re.IGNORECASE) for pattern in (
+    r'<a[^>]+id=["\']logo["\'][^>]+href=["\']([^"\']+)["\']',
+    r'<img[^>]+id=["\']logo["\'][^>]+src=["\']([^"\']+)["\']',
+    r'<img[^>]+class=["\'][^"\']*logo[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
+    r'<a[^>]+href=["\'](https?://[^"\']+/images/[^"\']+logo[^"\']+\.(?:png|jpg|jpeg|gif))["\'][^>]*>',
+))
+PHOTO_PATTERNS = tuple(re.compile(pattern.encode(), re.IGNORECASE) for pattern in (
+    r'<a[^>]+id=["\']photo["\'][^>]+href=["\']([^"\']+)["\']',
+    r'<img[^>]+id=["\']photo["\'][^>]+src=["\']([^"\']+)["\']',
+    r'<img[^>]+class=["\'][^"\']*photo[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
+))
+# Thumbnail suffixes stripped to get the full-size image
+SIZE_SUFFIX_RE = re.compile(r'_(?:thumb|small|medium)')
+
+# Without lxml, BeautifulSoup only builds the tags these lookups read, not the whole page
+DISCOGRAPHY_STRAINER = SoupStrainer(['table', 'a'])
+IMAGE_STRAINER = SoupStrainer(['a', 'img'])
+
+
+def loads_json(content):
+    """Decode a JSON response body (bytes) with orjson when it's installed."""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def parse_html(content):
+    """An lxml tree of page bytes. Parsers can't be shared between threads, and one is cheap to make."""
+    return lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding=PAGE_ENCODING))
+
+
+class BandInfo:
+    """A matched band: its page URL and name as Metal Archives lists it.
+
+    ``guessed`` marks a pick among several candidates that nothing singled out.
+    """
+    
+    def __init__(self, url, name, guessed=False):
+        self.url = url
+        self.name = name
+        self.guessed = guessed
+        self.id = None
+
 
 class MetalArchivesImageScraper:
     """Scraper for Metal Archives band logos and photos."""
     
-    def __init__(self, base_path="/Volumes/Eksternal/Audio"):
+    def __init__(self, base_path="/Volumes/Eksternal/Audio", cache=None):
         self.base_path = Path(base_path)
-        self.session = requests.Session()
-        # Use minimal headers that work (like curl)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-        })
+        # {'version', 'images': {saved path: {'url', 'etag', 'last_modified', 'size'}},
+        #  'bands': {band folder: {'url', 'name'}}}
+        self.cache = cache if cache is not None else {}
+        if self.cache.get('version') != CACHE_VERSION:
+            # Written by an older layout; start over rather than misread it
+            self.cache.clear()
+            self.cache['version'] = CACHE_VERSION
+        self.cache.setdefault('images', {})
+        self.cache.setdefault('bands', {})
+        # Bands are processed on several threads; each gets its own session and output buffer
+        self._local = threading.local()
+        # band URL -> Future of its discography tuple, shared by every band whose search lists it
+        self._discographies = {}
+        self._discographies_lock = threading.Lock()
+        # Long-lived, so its threads keep their sessions (and connections) between bands
+        self._discography_pool = ThreadPoolExecutor(max_workers=DISCOGRAPHY_WORKERS)
+        # Logo and photo downloads, shared the same way
+        self._download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+        # Held for every page fetch and download, so --workers can go high without flooding the site
+        self._request_slots = threading.BoundedSemaphore(MAX_IN_FLIGHT_REQUESTS)
     
-    def get_albums_from_folder(self, band_folder):
-        """Extract album/release names from band folder."""
-        albums = []
-        try:
-            if not band_folder.exists():
-                return albums
-            
-            # Look for common album folder patterns
-            for item in band_folder.iterdir():
-                if item.is_dir():
-                    # Album folder name
-                    album_name = item.name
-                    # Clean up common patterns
-                    album_name = album_name.split(' - ')[-1]  # Remove "Year - Album" format
-                    album_name = album_name.split(' (')[0]  # Remove "(Year)" or "(Type)"
-                    album_name = album_name.strip()
-                    if album_name:
-                        albums.append(album_name.lower())
-            
-            return albums
-        except Exception as e:
-            return albums
+    @property
+    def session(self):
+        """This thread's requests session, created on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # Use minimal headers that work (like curl)
+            session.headers.update({
+                'User-Agent': USER_AGENT,
+            })
+            # Keep-alive connections, so a band's search, page and images share a handshake
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+            session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry))
+            self._local.session = session
+        return session
     
-    def get_band_discography(self, band_url):
-        """Get band's discography from Metal Archives."""
+    def get_content(self, url, timeout=10):
+        """GET a page's raw bytes through this thread's session, falling back to curl if the
+        session is refused. The parsers and patterns read bytes, so the body is never decoded."""
+        with self._request_slots:
+            return self._get_content(url, timeout)
+    
+    def _get_content(self, url, timeout):
         try:
-            import subprocess
-            from bs4 import BeautifulSoup
-            
-            # Fetch band page using curl
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException:
+            # curl still gets through when Python clients are blocked
             result = subprocess.run(
-                ['curl', '-s', '-H', 'User-Agent: Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36', band_url],
+                ['curl', '-s', '-f', '-H', f'User-Agent: {USER_AGENT}', url],
                 capture_output=True,
-                text=True,
-                timeout=10
+                timeout=timeout
             )
-            
             if result.returncode != 0:
-                return []
-            
-            soup = BeautifulSoup(result.stdout, 'html.parser')
-            albums = []
-            
-            # Find discography section - Metal Archives has albums in a table
-            # Look for album links in the discography table
-            discography_table = soup.find('table', {'id': 'discography'}) or soup.find('table', class_=lambda x: x and 'discography' in str(x).lower())
-            
-            if discography_table:
-                for link in discography_table.find_all('a', href=lambda x: x and '/albums/' in x):
-                    album_name = link.get_text(strip=True)
-                    if album_name:
-                        # Clean up album name
-                        album_name = album_name.split(' (')[0]  # Remove "(Year)" or "(Type)"
-                        album_name = album_name.strip()
-                        albums.append(album_name.lower())
-            else:
-                # Fallback: look for any album links on the page
-                for link in soup.find_all('a', href=lambda x: x and '/albums/' in x):
-                    album_name = link.get_text(strip=True)
-                    if album_name and len(album_name) > 2:  # Filter out very short names
-                        album_name = album_name.split(' (')[0]
-                        album_name = album_name.strip()
-                        if album_name not in albums:
-                            albums.append(album_name.lower())
-            
-            return albums
-        except Exception as e:
+                raise
+            return result.stdout
+    
+    def log(self, *args, **kwargs):
+        """print() into this thread's band buffer, or straight to stdout outside the pool."""
+        print(*args, file=getattr(self._local, 'out', None), **kwargs)
+    
+    def get_albums_from_folder(self, band_folder):
+        """Extract album/release names from band folder."""
+        try:
+            # Look for common album folder patterns; a missing folder just has none.
+            # DirEntry.is_dir() answers from the listing, without a stat per entry
+            with os.scandir(band_folder) as it:
+                names = [self._clean_album(entry.name) for entry in it if entry.is_dir()]
+            return [name for name in names if name]
+        except OSError:
             return []
     
+    @staticmethod
+    def _clean_album(folder_name):
+        """An album folder name without its "Year - " prefix or "(...)" suffix, lowercased."""
+        return ALBUM_FOLDER_NOISE_RE.sub('', folder_name).strip().lower()
+    
+    def get_band_discography(self, band_url):
+        """Get band's discography from Metal Archives, fetching each band page once per run."""
+        with self._discographies_lock:
+            future = self._discographies.get(band_url)
+            owner = future is None
+            if owner:
+                self._discographies[band_url] = future = Future()
+        if not owner:
+            # Already fetched, or being fetched by another band's thread
+            return list(future.result())
+        
+        try:
+            albums = self._fetch_discography(band_url)
+        except Exception:
+            # Not cached, so a later band can retry it
+            with self._discographies_lock:
+                del self._discographies[band_url]
+            albums = ()
+        future.set_result(albums)
+        return list(albums)
+    
+    def _fetch_discography(self, band_url):
+        """Scrape the album names off a band's discography; raises on network errors."""
+        # The discography tab is a small fragment holding just the releases table, versus
+        # the whole band page; the page is only needed if the tab isn't there
+        match = BAND_ID_RE.search(band_url)
+        if match:
+            try:
+                fragment = self.get_content(DISCOGRAPHY_TAB_URL.format(band_id=match.group(1)))
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+            else:
+                if lxml is not None:
+                    tree = parse_html(fragment)
+                    link_texts = [link.text_content().strip() for link in tree.xpath('//a[contains(@href, "/albums/")]')]
+                else:
+                    soup = BeautifulSoup(fragment, 'html.parser', parse_only=DISCOGRAPHY_STRAINER, from_encoding=PAGE_ENCODING)
+                    link_texts = [link.get_text(strip=True) for link in soup.find_all('a', href=lambda x: x and '/albums/' in x)]
+                return self._albums_from_links(link_texts, in_table=True)
+        
+        # Fetch band page
+        band_html = self.get_content(band_url)
+        
+        # Find discography section - Metal Archives has albums in a table
+        # Look for album links in the discography table, else anywhere on the page
+        if lxml is not None:
+            tree = parse_html(band_html)
+            tables = tree.xpath(DISCOGRAPHY_ID_XPATH) or tree.xpath(DISCOGRAPHY_CLASS_XPATH)
+            discography_table = tables[0] if tables else None
+            scope = discography_table if discography_table is not None else tree
+            link_texts = [link.text_content().strip() for link in scope.xpath('.//a[contains(@href, "/albums/")]')]
+        else:
+            soup = BeautifulSoup(band_html, 'html.parser', parse_only=DISCOGRAPHY_STRAINER, from_encoding=PAGE_ENCODING)
+            discography_table = soup.find('table', {'id': 'discography'}) or soup.find('table', class_=lambda x: x and 'discography' in str(x).lower()) or None
+            scope = discography_table or soup
+            link_texts = [link.get_text(strip=True) for link in scope.find_all('a', href=lambda x: x and '/albums/' in x)]
+        return self._albums_from_links(link_texts, in_table=discography_table is not None)
+    
+    @staticmethod
+    def _albums_from_links(link_texts, in_table):
+        """Lowercased album names from album link texts, as a tuple."""
+        albums = []
+        
+        if in_table:
+            for album_name in link_texts:
+                if album_name:
+                    # Clean up album name
+                    album_name = album_name.split(' (')[0]  # Remove "(Year)" or "(Type)"
+                    album_name = album_name.strip()
+                    albums.append(album_name.lower())
+        else:
+            # Fallback: album links from anywhere on the page
+            for album_name in link_texts:
+                if album_name and len(album_name) > 2:  # Filter out very short names
+                    album_name = album_name.split(' (')[0]
+                    album_name = album_name.strip()
+                    if album_name not in albums:
+                        albums.append(album_name.lower())
+        
+        return tuple(albums)
+    
     def match_band_by_albums(self, candidates, folder_albums):
         """Match band candidates by comparing their discography with folder albums."""
         if not folder_albums:
@@ -106,39 +293,34 @@ class MetalArchivesImageScraper:
         
         best_match = None
         best_score = 0
+        # Each distinct folder album is scored once, weighted by how often it appears
+        folder_counts = Counter(folder_albums)
+        folder_set = folder_counts.keys()
         
-        for candidate in candidates:
-            band_url = candidate['url']
-            band_name = candidate['name']
-            
-            # Get discography for this band
-            discography = self.get_band_discography(band_url)
-            
+        # Fetch every candidate's discography at once; scoring then takes them in order
+        discographies = self._discography_pool.map(self.get_band_discography, [candidate['url'] for candidate in candidates])
+        
+        for candidate, discography in zip(candidates, discographies):
             if not discography:
                 continue
             
-            # Calculate match score
-            matches = 0
-            for folder_album in folder_albums:
-                # Check for exact match
-                if folder_album in discography:
-                    matches += 2
-                else:
-                    # Check for partial match (substring)
-                    for disc_album in discography:
-                        if folder_album in disc_album or disc_album in folder_album:
-                            matches += 1
-                            break
+            # Calculate match score: 2 per exact match, 1 per partial (substring) match
+            disc_set = set(discography)
+            exact = folder_set & disc_set
+            matches = 2 * sum(folder_counts[album] for album in exact)
+            for folder_album in folder_set - exact:
+                if any(folder_album in disc_album or disc_album in folder_album for disc_album in disc_set):
+                    matches += folder_counts[folder_album]
             
             # Score is matches / total folder albums
-            if folder_albums:
-                score = matches / len(folder_albums)
-            else:
-                score = 0
+            score = matches / len(folder_albums)
             
             if score > best_score:
                 best_score = score
                 best_match = candidate
+                if score >= 2:
+                    # Every folder album matched exactly; no later candidate can beat it
+                    break
         
         # Only return if we have a reasonable match (at least 30% match)
         if best_score >= 0.3:
@@ -147,10 +329,26 @@ class MetalArchivesImageScraper:
         return None
     
     def get_band_info(self, band_name, band_folder=None):
+        """Get band information from Metal Archives, reusing the band a folder matched on an earlier run."""
+        key = str(band_folder) if band_folder else band_name.lower()
+        cached = self.cache['bands'].get(key)
+        if not getattr(self, 'refresh', False) and isinstance(cached, dict) and cached.get('url'):
+            self.log("Using the band matched on a previous run (--refresh to search again)")
+            return BandInfo(cached['url'], cached.get('name') or band_name)
+        
+        band = self._search_band_info(band_name, band_folder)
+        if band is not None and not band.guessed:
+            # Only definite matches are kept; guesses and misses are searched for again
+            self.cache['bands'][key] = {'url': band.url, 'name': band.name}
+        elif band is not None:
+            # A guess replaces nothing; drop the old match rather than keep reusing it
+            self.cache['bands'].pop(key, None)
+        return band
+    
+    def _search_band_info(self, band_name, band_folder=None):
         """Get band information from Metal Archives using direct API access."""
         try:
             import time
-            from bs4 import BeautifulSoup
             from urllib.parse import urljoin
             
             # Get albums from folder if provided
@@ -158,58 +356,26 @@ class MetalArchivesImageScraper:
             if band_folder:
                 folder_albums = self.get_albums_from_folder(band_folder)
                 if folder_albums:
-                    print(f"Found {len(folder_albums)} albums in folder to match against")
+                    self.log(f"Found {len(folder_albums)} albums in folder to match against")
             
             # Use Metal Archives search API (same endpoint as Script Kit scripts use)
             # Build URL with query params directly (like curl does)
             from urllib.parse import quote
             search_url = f"https://www.metal-archives.com/search/ajax-band-search/?field=name&query={quote(band_name)}"
             
-            # Try using curl via subprocess first (works reliably), then fallback to urllib/requests
-            import subprocess
-            import json
-            
             try:
-                # Use curl directly (works when Python requests are blocked)
-                result = subprocess.run(
-                    ['curl', '-s', '-H', 'User-Agent: Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36', search_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                else:
-                    raise Exception("curl failed")
-            except Exception as e:
-                # Fallback to urllib
-                try:
-                    import urllib.request
-                    
-                    req = urllib.request.Request(search_url)
-                    req.add_header('User-Agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-                    
-                    with urllib.request.urlopen(req, timeout=10) as response:
-                        data = json.loads(response.read().decode('utf-8'))
-                except Exception as e2:
-                    # Final fallback to requests
-                    response = self.session.get(search_url, timeout=10)
-                    
-                    if response.status_code != 200:
-                        print(f"Error: HTTP {response.status_code} from Metal Archives")
-                        return None
-                    
-                    try:
-                        data = response.json()
-                    except:
-                        print(f"Error: Metal Archives returned invalid JSON response")
-                        print(f"This may indicate blocking or server issues")
-                        return None
+                data = loads_json(self.get_content(search_url))
+            except requests.RequestException as e:
+                self.log(f"Error: could not reach Metal Archives: {e}")
+                return None
+            except ValueError:
+                self.log(f"Error: Metal Archives returned invalid JSON response")
+                self.log(f"This may indicate blocking or server issues")
+                return None
             
             aa_data = data.get('aaData', [])
             if not aa_data or len(aa_data) == 0:
-                print(f"No bands found matching '{band_name}'")
+                self.log(f"No bands found matching '{band_name}'")
                 return None
             
             # Extract all band candidates
@@ -221,7 +387,7 @@ class MetalArchivesImageScraper:
                 if not first_col:
                     continue
                 
-                soup = BeautifulSoup(first_col, 'html.parser')
+                soup = BeautifulSoup(first_col, SOUP_PARSER)
                 link = soup.find('a')
                 if link:
                     found_name = link.get_text(strip=True)
@@ -238,59 +404,62 @@ class MetalArchivesImageScraper:
                         exact_matches.append(candidate)
             
             if not candidates:
-                print(f"No bands found matching '{band_name}'")
+                self.log(f"No bands found matching '{band_name}'")
                 return None
             
+            # A lone result, or the only one named exactly like the folder, needs no
+            # disambiguation; that's most bands, and it saves a discography fetch per candidate
+            if len(candidates) == 1 or len(exact_matches) == 1:
+                match = candidates[0] if len(candidates) == 1 else exact_matches[0]
+                if len(candidates) > 1:
+                    self.log(f"Using exact name match: {match['name']}")
+                return BandInfo(match['url'], match['name'])
+            
             # If we have folder albums, try to match by discography
-            if folder_albums and len(candidates) > 1:
-                print(f"Matching against discography for {len(candidates)} candidates...")
+            if folder_albums:
+                self.log(f"Matching against discography for {len(candidates)} candidates...")
                 matched_band = self.match_band_by_albums(candidates, folder_albums)
+                guessed = not matched_band
                 if matched_band:
-                    print(f"Matched by discography: {matched_band['name']}")
+                    self.log(f"Matched by discography: {matched_band['name']}")
                     band_url = matched_band['url']
                     band_name_found = matched_band['name']
                 elif exact_matches:
                     # Use exact match if available
                     band_url = exact_matches[0]['url']
                     band_name_found = exact_matches[0]['name']
-                    print(f"Using exact name match: {band_name_found}")
+                    self.log(f"Using exact name match: {band_name_found}")
                 else:
                     # Use first result
                     band_url = candidates[0]['url']
                     band_name_found = candidates[0]['name']
-                    print(f"Warning: Multiple bands found, using first result: {band_name_found}")
+                    self.log(f"Warning: Multiple bands found, using first result: {band_name_found}")
             elif exact_matches:
                 # Use exact match if available
                 band_url = exact_matches[0]['url']
                 band_name_found = exact_matches[0]['name']
+                guessed = True
             else:
                 # Use first result
                 band_url = candidates[0]['url']
                 band_name_found = candidates[0]['name']
-                if len(candidates) > 1:
-                    print(f"Warning: Multiple bands found, using first result: {band_name_found}")
+                guessed = True
+                self.log(f"Warning: Multiple bands found, using first result: {band_name_found}")
             
-            # Create a simple object with url attribute
-            class BandInfo:
-                def __init__(self, url, name):
-                    self.url = url
-                    self.name = name
-                    self.id = None
-            
-            return BandInfo(band_url, band_name_found)
+            return BandInfo(band_url, band_name_found, guessed)
                 
         except Exception as e:
             error_msg = str(e)
             if "JSONDecodeError" in error_msg or "Expecting value" in error_msg:
-                print(f"Error: Metal Archives may be blocking requests or returning empty responses.")
-                print(f"This could be due to:")
-                print(f"  1. Temporary rate limiting - wait a few minutes and try again")
-                print(f"  2. IP blocking - try using a VPN or different network")
-                print(f"  3. Metal Archives server issues - try again later")
+                self.log(f"Error: Metal Archives may be blocking requests or returning empty responses.")
+                self.log(f"This could be due to:")
+                self.log(f"  1. Temporary rate limiting - wait a few minutes and try again")
+                self.log(f"  2. IP blocking - try using a VPN or different network")
+                self.log(f"  3. Metal Archives server issues - try again later")
             else:
-                print(f"Error searching for band '{band_name}': {e}")
+                self.log(f"Error searching for band '{band_name}': {e}")
             import traceback
-            traceback.print_exc()
+            self.log(traceback.format_exc(), end='')
             return None
     
     def get_image_urls(self, band):
@@ -299,193 +468,171 @@ class MetalArchivesImageScraper:
         
         try:
             from urllib.parse import urljoin
-            from bs4 import BeautifulSoup
-            import re
             
             # Get band page URL
             band_url = getattr(band, 'url', None)
             if not band_url:
-                print("Could not determine band URL")
+                self.log("Could not determine band URL")
                 return images
             
-            # Fetch the band page HTML using curl (works when Python requests are blocked)
-            import subprocess
-            
-            try:
-                result = subprocess.run(
-                    ['curl', '-s', '-H', 'User-Agent: Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36', band_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    band_html = result.stdout
-                else:
-                    raise Exception("curl failed")
-            except Exception as e:
-                # Fallback to requests
-                response = self.session.get(band_url, timeout=10)
-                response.raise_for_status()
-                band_html = response.text
-            
-            # Use multiple regex patterns to find logo URL (same approach as Script Kit scripts)
-            patterns = [
-                r'<a[^>]+id=["\']logo["\'][^>]+href=["\']([^"\']+)["\']',
-                r'<img[^>]+id=["\']logo["\'][^>]+src=["\']([^"\']+)["\']',
-                r'<img[^>]+class=["\'][^"\']*logo[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
-                r'<a[^>]+href=["\'](https?://[^"\']+/images/[^"\']+logo[^"\']+\.(?:png|jpg|jpeg|gif))["\'][^>]*>',
-            ]
-            
-            logo_url = None
-            for pattern in patterns:
-                match = re.search(pattern, band_html, re.IGNORECASE)
-                if match and match.group(1):
-                    logo_url = match.group(1)
-                    break
-            
-            # Also try BeautifulSoup as fallback
-            soup = None
-            if not logo_url:
-                soup = BeautifulSoup(band_html, 'html.parser')
+            # Fetch the band page HTML
+            band_html = self.get_content(band_url)
+            
+            # The regex patterns almost always hit, so most pages are never parsed
+            tree = None
+            for kind, patterns in (('logo', LOGO_PATTERNS), ('photo', PHOTO_PATTERNS)):
+                image_url = None
+                for pattern in patterns:
+                    match = pattern.search(band_html)
+                    if match and match.group(1):
+                        image_url = match.group(1).decode(PAGE_ENCODING, 'replace')
+                        break
                 
-                # Find logo - try multiple methods
-                logo_elem = soup.find('a', {'id': 'logo'})
-                if logo_elem:
-                    logo_url = logo_elem.get('href', '')
-                else:
-                    logo_elem = soup.find('img', {'id': 'logo'})
-                    if logo_elem:
-                        logo_url = logo_elem.get('src', '')
-                    else:
-                        # Try finding by class
-                        logo_elem = soup.find('img', class_=lambda x: x and 'logo' in x.lower())
-                        if logo_elem:
-                            logo_url = logo_elem.get('src', '')
-                        else:
-                            # Last resort: search all images for logo-like URLs
-                            for img in soup.find_all('img'):
-                                src = img.get('src', '')
-                                if src and ('logo' in src.lower() or 'band_logo' in src.lower()):
-                                    logo_url = src
-                                    break
-            
-            if logo_url:
-                # Convert to full-size (remove thumb/small suffixes)
-                logo_url = logo_url.replace('_thumb', '').replace('_small', '').replace('_medium', '')
-                # Make URL absolute if needed
-                if not logo_url.startswith('http'):
-                    logo_url = urljoin(band_url, logo_url)
-                images['logo'] = logo_url
-            
-            # Find band photo using similar approach
-            photo_patterns = [
-                r'<a[^>]+id=["\']photo["\'][^>]+href=["\']([^"\']+)["\']',
-                r'<img[^>]+id=["\']photo["\'][^>]+src=["\']([^"\']+)["\']',
-                r'<img[^>]+class=["\'][^"\']*photo[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
-            ]
-            
-            photo_url = None
-            for pattern in photo_patterns:
-                match = re.search(pattern, band_html, re.IGNORECASE)
-                if match and match.group(1):
-                    photo_url = match.group(1)
-                    break
-            
-            # Also try BeautifulSoup as fallback
-            if not photo_url:
-                if soup is None:
-                    soup = BeautifulSoup(band_html, 'html.parser')
+                # Fall back to searching the parsed page
+                if not image_url:
+                    if tree is None:
+                        tree = self._parse_page(band_html)
+                    image_url = self._image_url_from_page(tree, kind)
                 
-                photo_elem = soup.find('a', {'id': 'photo'})
-                if photo_elem:
-                    photo_url = photo_elem.get('href', '')
-                else:
-                    photo_elem = soup.find('img', {'id': 'photo'})
-                    if photo_elem:
-                        photo_url = photo_elem.get('src', '')
-                    else:
-                        # Try finding by class
-                        photo_elem = soup.find('img', class_=lambda x: x and 'photo' in x.lower())
-                        if photo_elem:
-                            photo_url = photo_elem.get('src', '')
-                        else:
-                            # Last resort: search all images for photo-like URLs
-                            for img in soup.find_all('img'):
-                                src = img.get('src', '')
-                                if src and ('photo' in src.lower() or 'band_photo' in src.lower()):
-                                    photo_url = src
-                                    break
-            
-            if photo_url:
-                # Convert to full-size (remove thumb/small suffixes)
-                photo_url = photo_url.replace('_thumb', '').replace('_small', '').replace('_medium', '')
-                # Make URL absolute if needed
-                if not photo_url.startswith('http'):
-                    photo_url = urljoin(band_url, photo_url)
-                images['photo'] = photo_url
+                if image_url:
+                    # Convert to full-size (remove thumb/small suffixes)
+                    image_url = SIZE_SUFFIX_RE.sub('', image_url)
+                    # Make URL absolute if needed
+                    if not image_url.startswith('http'):
+                        image_url = urljoin(band_url, image_url)
+                    images[kind] = image_url
             
         except Exception as e:
-            print(f"Error extracting image URLs: {e}")
+            self.log(f"Error extracting image URLs: {e}")
             import traceback
-            traceback.print_exc()
+            self.log(traceback.format_exc(), end='')
         
         return images
     
+    @staticmethod
+    def _parse_page(html):
+        """An lxml tree of the page bytes, or a BeautifulSoup one when lxml isn't installed."""
+        if lxml is not None:
+            return parse_html(html)
+        return BeautifulSoup(html, 'html.parser', parse_only=IMAGE_STRAINER, from_encoding=PAGE_ENCODING)
+    
+    @staticmethod
+    def _image_url_from_page(tree, kind):
+        """The URL for the 'logo' or 'photo' image: the #kind link, the #kind image, an image
+        with a matching class, then any image whose src mentions it (None if nothing matches)."""
+        if lxml is not None:
+            for xpath, attr in ((f'//a[@id="{kind}"]', 'href'), (f'//img[@id="{kind}"]', 'src'),
+                                (f'//img[contains(translate(@class, "{kind.upper()}", "{kind}"), "{kind}")]', 'src')):
+                elems = tree.xpath(xpath)
+                if elems:
+                    return elems[0].get(attr, '')
+            imgs = tree.iter('img')
+        else:
+            elem = tree.find('a', {'id': kind})
+            if elem:
+                return elem.get('href', '')
+            elem = tree.find('img', {'id': kind}) or tree.find('img', class_=lambda x: x and kind in x.lower())
+            if elem:
+                return elem.get('src', '')
+            imgs = tree.find_all('img')
+        # Last resort: search all images for kind-like URLs
+        for img in imgs:
+            src = img.get('src', '')
+            if src and kind in src.lower():
+                return src
+        return None
+    
     def download_image(self, url, output_path):
         """Download an image from URL to output path."""
+        with self._request_slots:
+            return self._download_image(url, output_path)
+    
+    def _download_image(self, url, output_path):
         try:
-            import subprocess
-            
             # Ensure directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Try using curl first (works when Python requests are blocked)
+            # Re-downloads (--force) ask the server whether the image changed since we saved it;
+            # only for a file still the size it was saved at, so a partial download is refetched
+            key = str(output_path)
+            images = self.cache['images']
+            saved = images.get(key)
+            headers = {}
+            if isinstance(saved, dict) and saved.get('url') == url:
+                try:
+                    unchanged_locally = output_path.stat().st_size == saved.get('size')
+                except OSError:
+                    unchanged_locally = False
+                if unchanged_locally:
+                    if saved.get('etag'):
+                        headers['If-None-Match'] = saved['etag']
+                    if saved.get('last_modified'):
+                        headers['If-Modified-Since'] = saved['last_modified']
+            
             try:
+                response = self.session.get(url, timeout=30, stream=True, headers=headers)
+                response.raise_for_status()
+            except requests.RequestException:
+                images.pop(key, None)
+                # Fall back to curl (works when Python requests are blocked)
                 result = subprocess.run(
-                    ['curl', '-s', '-L', '-H', 'User-Agent: Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36', '-o', str(output_path), url],
+                    ['curl', '-s', '-f', '-L', '-H', f'User-Agent: {USER_AGENT}', '-o', str(output_path), url],
                     timeout=30
                 )
                 
                 if result.returncode == 0 and output_path.exists() and output_path.stat().st_size > 0:
                     return True
-                else:
-                    raise Exception("curl download failed")
-            except Exception as e:
-                # Fallback to requests
-                response = self.session.get(url, timeout=30, stream=True)
-                response.raise_for_status()
-                
-                # Check content type
-                content_type = response.headers.get('content-type', '')
-                if 'image' not in content_type:
-                    print(f"Warning: {url} may not be an image (content-type: {content_type})")
-                
-                # Download image
-                with open(output_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
+                raise
+            
+            if response.status_code == 304:
+                response.close()
+                self.log("Not modified since the last download; keeping the existing file")
                 return True
+            
+            # Check content type
+            content_type = response.headers.get('content-type', '')
+            if 'image' not in content_type:
+                self.log(f"Warning: {url} may not be an image (content-type: {content_type})")
+            
+            # Download image, straight from the socket in 64 KB reads (gzip still undone)
+            images.pop(key, None)
+            response.raw.decode_content = True
+            with open(output_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                images[key] = {'url': url, 'etag': etag, 'last_modified': last_modified,
+                               'size': output_path.stat().st_size}
+            return True
         except Exception as e:
-            print(f"Error downloading {url}: {e}")
+            self.log(f"Error downloading {url}: {e}")
             return False
     
+    def _download_captured(self, url, output_path):
+        """download_image() on a pool thread, returning (ok, its printed output)."""
+        self._local.out = buffer = io.StringIO()
+        try:
+            return self.download_image(url, output_path), buffer.getvalue()
+        finally:
+            self._local.out = None
+    
     def process_band(self, band_folder_path):
         """Process a single band folder."""
         band_folder = Path(band_folder_path)
         
         if not band_folder.exists():
-            print(f"Error: Band folder does not exist: {band_folder}")
+            self.log(f"Error: Band folder does not exist: {band_folder}")
             return False
         
         # Extract band name from folder path
         band_name = band_folder.name
         
-        print(f"\n{'='*60}")
-        print(f"Processing: {band_name}")
-        print(f"Folder: {band_folder}")
-        print(f"{'='*60}")
+        self.log(f"\n{'='*60}")
+        self.log(f"Processing: {band_name}")
+        self.log(f"Folder: {band_folder}")
+        self.log(f"{'='*60}")
         
         # Check if images already exist
         logo_path = band_folder / 'logo.png'
@@ -495,8 +642,8 @@ class MetalArchivesImageScraper:
         force = getattr(self, 'force', False)
         
         if not force and logo_path.exists() and photo_path.exists():
-            print(f"Images already exist for {band_name}. Skipping...")
-            print("Use --force to re-download.")
+            self.log(f"Images already exist for {band_name}. Skipping...")
+            self.log("Use --force to re-download.")
             return True
         
         # Get band information (pass band folder to match by albums)
@@ -514,46 +661,44 @@ class MetalArchivesImageScraper:
         elif band_id:
             band_url = f"https://www.metal-archives.com/bands/{band_id}"
         
-        print(f"Found band: {band_name_found}")
+        self.log(f"Found band: {band_name_found}")
         if band_id:
-            print(f"Band ID: {band_id}")
+            self.log(f"Band ID: {band_id}")
         if band_url:
-            print(f"Band URL: {band_url}")
+            self.log(f"Band URL: {band_url}")
         
         # Get image URLs
         images = self.get_image_urls(band)
         
         if not images:
-            print(f"No images found for {band_name}")
+            self.log(f"No images found for {band_name}")
             return False
         
         success = True
         
-        # Download logo (no background removal)
-        if images.get('logo'):
-            print(f"\nDownloading logo from: {images['logo']}")
-            if self.download_image(images['logo'], logo_path):
-                print(f"✓ Logo saved successfully: {logo_path}")
-            else:
-                print("✗ Failed to download logo")
-                success = False
-        else:
-            print("No logo found")
+        # Download logo (no background removal) and band photo at the same time; each
+        # download's messages are captured and reported in order once both are done
+        downloads = {}
+        for kind, path in (('logo', logo_path), ('photo', photo_path)):
+            if images.get(kind):
+                downloads[kind] = self._download_pool.submit(self._download_captured, images[kind], path)
         
-        # Download band photo
-        if images.get('photo'):
-            print(f"\nDownloading photo from: {images['photo']}")
-            if self.download_image(images['photo'], photo_path):
-                print(f"✓ Photo saved successfully: {photo_path}")
+        for kind, path, missing in (('logo', logo_path, "No logo found"), ('photo', photo_path, "No band photo found")):
+            if kind not in downloads:
+                self.log(missing)
+                continue
+            ok, output = downloads[kind].result()
+            self.log(f"\nDownloading {kind} from: {images[kind]}")
+            self.log(output, end='')
+            if ok:
+                self.log(f"✓ {kind.capitalize()} saved successfully: {path}")
             else:
-                print("✗ Failed to download photo")
+                self.log(f"✗ Failed to download {kind}")
                 success = False
-        else:
-            print("No band photo found")
         
         return success
     
-    def process_all_bands(self, genre_path=None):
+    def process_all_bands(self, genre_path=None, workers=DEFAULT_WORKERS):
         """Process all bands in the directory structure."""
         if genre_path is None:
             genre_path = self.base_path / "Metal"
@@ -571,32 +716,22 @@ class MetalArchivesImageScraper:
         band_folders = []
         seen_band_folders = set()
         
-        # First pass: identify band folders (those with album subdirectories)
-        for root, dirs, files in os.walk(genre_path):
-            root_path = Path(root)
-            
+        # First pass: identify band folders (those with album subdirectories); one scandir
+        # per folder answers every question below, with no per-folder stat calls
+        for root, depth, has_subdirs, files in walk_entries(str(genre_path), detailed=True):
             # Skip if this is the base genre path
-            if root_path == genre_path:
+            if depth == 0:
                 continue
+            names = {entry.name for entry in files}
             
             # Check if this folder has music files directly (likely an album folder, not band folder)
-            has_music_files = any(f.lower().endswith(('.mp3', '.flac', '.m4a', '.wav', '.ogg', '.aac')) 
-                                 for f in files)
-            
-            # Check if it has subdirectories (likely album folders)
-            has_subdirs = bool(dirs)
+            has_music_files = any(f[f.rfind('.'):].lower() in AUDIO_EXTS for f in names)
             
             # A band folder is one that:
             # 1. Has subdirectories (album folders), OR
             # 2. Has music files AND is at a certain depth (likely a band folder with albums as subdirs)
             # 3. Is NOT a leaf node with music files (those are album folders)
             
-            # Calculate depth from genre_path
-            try:
-                depth = len(root_path.relative_to(genre_path).parts)
-            except:
-                depth = 0
-            
             # Band folders are typically at depth 1 (e.g., Metal/D/BandName/)
             # Album folders are typically at depth 2+ (e.g., Metal/D/BandName/AlbumName/)
             is_band_folder = False
@@ -617,11 +752,9 @@ class MetalArchivesImageScraper:
             
             if is_band_folder:
                 # Check if it doesn't already have both images
-                logo_path = root_path / 'logo.png'
-                photo_path = root_path / 'artist.jpg'
-                
-                if not (logo_path.exists() and photo_path.exists()):
+                if not ('logo.png' in names and 'artist.jpg' in names):
                     # Avoid duplicates
+                    root_path = Path(root)
                     if root_path not in seen_band_folders:
                         band_folders.append(root_path)
                         seen_band_folders.add(root_path)
@@ -632,16 +765,32 @@ class MetalArchivesImageScraper:
             print("No band folders found or all already have images.")
             return
         
-        # Process each band
+        # Process bands several at a time: each one is mostly waiting on Metal Archives.
+        # A band's output is buffered and printed in one piece when it finishes.
         successful = 0
         failed = 0
         
-        for i, folder in enumerate(band_folders, 1):
-            print(f"\n[{i}/{len(band_folders)}]")
-            if self.process_band(folder):
-                successful += 1
-            else:
-                failed += 1
+        def run(folder):
+            self._local.out = buffer = io.StringIO()
+            try:
+                ok = self.process_band(folder)
+            except Exception as e:
+                self.log(f"Error processing {folder}: {e}")
+                ok = False
+            finally:
+                self._local.out = None
+            return ok, buffer.getvalue()
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(run, folder) for folder in band_folders]
+            for i, future in enumerate(as_completed(futures), 1):
+                ok, output = future.result()
+                print(f"\n[{i}/{len(band_folders)}]")
+                print(output, end='')
+                if ok:
+                    successful += 1
+                else:
+                    failed += 1
         
         print(f"\n{'='*60}")
         print(f"Processing complete!")
@@ -691,22 +840,43 @@ Examples:
         action='store_true',
         help='Re-download images even if they already exist'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Bands to process concurrently with --all (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Search for every band again, replacing the matches saved by earlier runs'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Ignore and don\'t update the band and download cache (in {CACHE_DIR})'
+    )
     
     args = parser.parse_args()
     
     # Script uses direct Metal Archives API access (no external library required)
     
-    scraper = MetalArchivesImageScraper(args.base_path)
+    cache = {} if args.no_cache else load_json_cache(CACHE_PATH)
+    scraper = MetalArchivesImageScraper(args.base_path, cache)
     scraper.force = args.force
+    scraper.refresh = args.refresh
     
     if args.all or not args.band_path:
         # If --path is specified, use it; otherwise use default Metal directory
         if args.path:
-            scraper.process_all_bands(args.path)
+            scraper.process_all_bands(args.path, args.workers)
         else:
-            scraper.process_all_bands()
+            scraper.process_all_bands(workers=args.workers)
     else:
         scraper.process_band(args.band_path)
+    
+    if not args.no_cache:
+        save_json_cache(scraper.cache, CACHE_PATH)
 
 
 if __name__ == '__main__':
@@ -5,55 +5,71 @@ Now with --strict mode to flag albums not starting at 01 or with numbering reset
 """
 
 from pathlib import Path
-import re
+import os
 import argparse
+import sys
 from typing import List, Dict
+from utils.walk import walk_entries
 
-class TrackGapChecker:
-    TRACK_PATTERN = re.compile(r"^(\d{1,2})[.\-_\s]")  # e.g. "01.", "02 -", "03_"
+# Characters that may follow a track number besides whitespace, e.g. "01.", "02 -", "03_"
+TRACK_SEPARATORS = frozenset(".-_")
 
+class TrackGapChecker:
     def __init__(self, archive_root: Path, strict: bool = False):
         self.root = Path(archive_root)
         self.strict = strict
 
-    def extract_track_number(self, filename: str) -> int:
-        match = self.TRACK_PATTERN.match(filename)
-        if match:
-            try:
-                return int(match.group(1))
-            except ValueError:
-                return None
+    @staticmethod
+    def extract_track_number(filename: str) -> int:
+        # One or two leading digits then a separator; checking the first three characters
+        # directly is cheaper than running a regex over every filename
+        if filename[:1].isdecimal():
+            c1 = filename[1:2]
+            if c1.isdecimal():
+                c2 = filename[2:3]
+                if c2 in TRACK_SEPARATORS or c2.isspace():
+                    return int(filename[:2])
+            elif c1 in TRACK_SEPARATORS or c1.isspace():
+                return int(filename[0])
         return None
 
-    def check_album_folder(self, folder: Path) -> Dict:
-        tracks = []
-        for f in folder.iterdir():
-            if f.is_file() and not f.name.startswith("."):
-                num = self.extract_track_number(f.name)
-                if num is not None:
-                    tracks.append(num)
+    def check_album_folder(self, folder: Path, tracks: List[int] = None) -> Dict:
+        if tracks is None:
+            tracks = []
+            with os.scandir(folder) as it:
+                for entry in it:
+                    # Name test first: is_file() is only asked of track-numbered entries
+                    if not entry.name.startswith("."):
+                        num = self.extract_track_number(entry.name)
+                        if num is not None and entry.is_file():
+                            tracks.append(num)
 
         if not tracks:
             return {"folder": str(folder), "tracks": [], "missing": [], "strict_warnings": []}
 
-        tracks = sorted(set(tracks))
-        expected = list(range(tracks[0], tracks[-1] + 1))
-        missing = [n for n in expected if n not in tracks]
+        present = set(tracks)
+        tracks = sorted(present)
+        missing = [n for n in range(tracks[0], tracks[-1] + 1) if n not in present]
 
         strict_warnings = []
         if self.strict:
             if tracks[0] != 1:
                 strict_warnings.append(f"Does not start at 01 (starts at {tracks[0]:02d})")
-            if tracks != sorted(tracks):
-                strict_warnings.append("Track numbers out of order")
             # Detect large jumps (e.g. 01, 02, 07)
             for i in range(1, len(tracks)):
                 if tracks[i] - tracks[i-1] > 2:
                     strict_warnings.append(f"Jump from {tracks[i-1]:02d} to {tracks[i]:02d}")
 
-        return {"folder": str(folder), "tracks": tracks, "missing": missing, "strict_warnings": strict_warnings}
+        report = {"folder": str(folder), "tracks": tracks, "missing": missing, "strict_warnings": strict_warnings}
+        if missing or strict_warnings:
+            # Names for print_report, worked out once per flagged album and without building Paths
+            parent = os.path.dirname(report["folder"])
+            report["folder_name"] = os.path.basename(report["folder"])
+            report["parent_name"] = os.path.basename(parent) if os.path.normpath(parent) != str(self.root) else ""
+        return report
 
-    def scan_archive(self) -> Dict:
+    def scan_archive(self, walk=None) -> Dict:
+        """Check every album folder; ``walk`` may be a walk_entries() result another tool already collected."""
         results = {
             "albums": [], 
             "albums_with_gaps": 0, 
@@ -63,11 +79,18 @@ class TrackGapChecker:
             "total_albums": 0
         }
 
-        for dirpath, _, filenames in self.root.walk():
-            folder = Path(dirpath)
-            if any(self.extract_track_number(f) for f in filenames):
+        extract_track_number = self.extract_track_number
+        for dirpath, files in walk if walk is not None else walk_entries(str(self.root)):
+            # One regex pass per folder collects the track numbers the report is built from;
+            # is_file() comes from the directory read, so non-symlinks cost no extra stat
+            tracks = []
+            for entry in files:
+                num = extract_track_number(entry.name)
+                if num is not None and entry.is_file():
+                    tracks.append(num)
+            if any(tracks):
                 results["total_albums"] += 1
-                report = self.check_album_folder(folder)
+                report = self.check_album_folder(dirpath, tracks)
                 if report["missing"] or report["strict_warnings"]:
                     results["albums"].append(report)
                     results["albums_with_gaps"] += 1
@@ -114,12 +137,9 @@ def print_report(results: Dict, archive_path: str, strict_mode: bool, output_fil
             report_lines.append("🔢 ALBUMS WITH MISSING TRACKS")
             report_lines.append("-" * 50)
             for i, album in enumerate(results['missing_tracks'], 1):
-                folder_name = Path(album['folder']).name
-                parent_name = Path(album['folder']).parent.name if Path(album['folder']).parent != Path(archive_path) else ""
-                
-                report_lines.append(f"{i:2d}. {folder_name}")
-                if parent_name:
-                    report_lines.append(f"    📁 Parent: {parent_name}")
+                report_lines.append(f"{i:2d}. {album['folder_name']}")
+                if album['parent_name']:
+                    report_lines.append(f"    📁 Parent: {album['parent_name']}")
                 report_lines.append(f"    🎵 Found Tracks: {album['tracks']}")
                 report_lines.append(f"    ❌ Missing: {album['missing']}")
                 if album['strict_warnings']:
@@ -134,12 +154,9 @@ def print_report(results: Dict, archive_path: str, strict_mode: bool, output_fil
             report_lines.append("⚠️  ALBUMS WITH NUMBERING ISSUES (Strict Mode)")
             report_lines.append("-" * 55)
             for i, album in enumerate(strict_only, 1):
-                folder_name = Path(album['folder']).name
-                parent_name = Path(album['folder']).parent.name if Path(album['folder']).parent != Path(archive_path) else ""
-                
-                report_lines.append(f"{i:2d}. {folder_name}")
-                if parent_name:
-                    report_lines.append(f"    📁 Parent: {parent_name}")
+                report_lines.append(f"{i:2d}. {album['folder_name']}")
+                if album['parent_name']:
+                    report_lines.append(f"    📁 Parent: {album['parent_name']}")
                 report_lines.append(f"    🎵 Found Tracks: {album['tracks']}")
                 report_lines.append(f"    ⚠️  Issues:")
                 for warn in album['strict_warnings']:
@@ -165,15 +182,15 @@ def print_report(results: Dict, archive_path: str, strict_mode: bool, output_fil
     report_lines.append(f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     report_lines.append("=" * 80)
     
-    # Output to console
-    for line in report_lines:
-        print(line)
+    # Output to console in one write rather than a line-buffered flush per line
+    report_text = '\n'.join(report_lines)
+    sys.stdout.write(report_text + '\n')
     
     # Save to file if specified
     if output_file:
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(report_lines))
+                f.write(report_text)
             print(f"\n📄 Report saved to: {output_file}")
         except Exception as e:
             print(f"\n❌ Error saving report to {output_file}: {e}")
@@ -0,0 +1 @@
+"""Helpers shared by the top-level hoarder scripts."""
@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+
+# Every script's caches live together, under XDG_CACHE_HOME when it's set
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "hoarder-tools")
+
+def load_json_cache(path):
+    """Load a JSON cache ({} if missing or unreadable)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_json_cache(cache, path):
+    """Write a JSON cache through a temp file, so an interrupted write leaves the old one intact.
+
+    If writing fails the cache is simply not updated; the next run works it out again.
+    """
+    folder = os.path.dirname(path)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    finally:
+        # Gone already once os.replace has moved it into place
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,13 @@
+import os
+
+def describe_folder(folder):
+    """Return (letter, artist, album) from the last three path components."""
+    # rsplit stops after three separators, so deep paths don't build a list of every component
+    parts = folder.strip(os.sep).rsplit(os.sep, 3)
+    if len(parts) == 4:
+        return parts[1], parts[2], parts[3]
+    if len(parts) == 3:
+        return parts[0], parts[1], parts[2]
+    if len(parts) == 2:
+        return parts[0], parts[1], ""
+    return "", parts[0], ""
@@ -0,0 +1,33 @@
+import io
+from rich.console import Console
+
+OUTPUT_FLUSH_LINES = 256
+
+class ConsoleBuffer:
+    """Collect Rich markup lines and print them with one console.print per batch."""
+
+    def __init__(self, console, flush_every=OUTPUT_FLUSH_LINES):
+        self.console = console
+        self.flush_every = flush_every
+        self._lines = []
+
+    def add(self, line):
+        self._lines.append(line)
+        if len(self._lines) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.console.print("\n".join(self._lines))
+            self._lines.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+def capture_console(console, file=None):
+    """A Console rendering into memory (``file``, else a fresh StringIO) with the same settings, for workers whose output is printed later."""
+    return Console(file=file if file is not None else io.StringIO(), force_terminal=console.is_terminal,
+                   color_system=console.color_system, width=console.width)
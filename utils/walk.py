@@ -0,0 +1,94 @@
+import os
+import re
+import subprocess
+from functools import lru_cache
+
+# Concurrent scanners per filesystem before per-volume locking (notably APFS) stops paying off
+WORKERS_PER_VOLUME = 4
+# Network mounts are latency-bound rather than lock-bound, so keep many more requests in flight
+REMOTE_WORKERS = 32
+REMOTE_FS_TYPES = frozenset({"nfs", "nfs4", "cifs", "smb3", "smbfs", "afpfs", "webdav", "9p", "fuse.sshfs", "fuse.rclone"})
+
+def sorted_walk(root):
+    """os.walk that descends in alphabetical order, for readahead-friendly traversal."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        yield dirpath, dirnames, filenames
+
+# macOS / BSD `mount` lines: "//user@server/share on /Volumes/share (smbfs, nodev, ...)"
+MOUNT_LINE_RE = re.compile(r"^.+? on (.+) \(([^,)]+)")
+
+def _proc_mounts():
+    """(mount point, fs type) pairs from /proc/mounts (Linux)."""
+    mounts = []
+    with open("/proc/mounts", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 3:
+                # Mount points escape spaces and tabs as octal
+                point = fields[1].replace("\\040", " ").replace("\\011", "\t")
+                mounts.append((point, fields[2]))
+    return mounts
+
+def _mount_command():
+    """(mount point, fs type) pairs parsed from `mount` output (macOS and the BSDs)."""
+    result = subprocess.run(["mount"], capture_output=True, text=True, check=True)
+    mounts = []
+    for line in result.stdout.splitlines():
+        match = MOUNT_LINE_RE.match(line)
+        if match:
+            mounts.append((match.group(1), match.group(2).strip()))
+    return mounts
+
+@lru_cache(maxsize=1)
+def _mount_table():
+    """(mount point, fs type) pairs, longest mount point first; empty if neither source can be read."""
+    try:
+        mounts = _proc_mounts() if os.path.exists("/proc/mounts") else _mount_command()
+    except (OSError, subprocess.SubprocessError):
+        mounts = []
+    mounts.sort(key=lambda m: len(m[0]), reverse=True)
+    return mounts
+
+def is_remote_filesystem(path):
+    """True if path lives on a network mount (NFS, SMB, sshfs, ...), judged once from the mount table."""
+    path = os.path.realpath(path)
+    for point, fs_type in _mount_table():
+        if path == point or path.startswith(point.rstrip(os.sep) + os.sep):
+            return fs_type in REMOTE_FS_TYPES
+    return False
+
+def default_workers(root, local_default, per_volume=None, remote_default=REMOTE_WORKERS):
+    """Worker count to use when none was given, judged from the root alone.
+
+    Network mounts get ``remote_default``, since their threads wait on latency; on a local disk,
+    ``per_volume`` (e.g. WORKERS_PER_VOLUME) caps ``local_default`` where per-volume locking limits scaling.
+    """
+    if is_remote_filesystem(root):
+        return remote_default
+    return min(local_default, per_volume) if per_volume else local_default
+
+def walk_entries(root, detailed=False):
+    """Top-down walk in os.walk order, yielding (dirpath, file DirEntries) so callers keep inode and type info.
+
+    With ``detailed``, yields (dirpath, depth, has_subdirs, file DirEntries) instead; depth is 0 for
+    root, and has_subdirs counts symlinked folders too, as os.walk's dirnames would.
+    """
+    stack = [(root, 0)]
+    while stack:
+        dirpath, depth = stack.pop()
+        subdirs, files, has_subdirs = [], [], False
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    # Symlinks to folders are neither followed nor yielded as files
+                    if entry.is_dir():
+                        has_subdirs = True
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        files.append(entry)
+        except OSError:
+            continue
+        yield (dirpath, depth, has_subdirs, files) if detailed else (dirpath, files)
+        stack.extend((path, depth + 1) for path in reversed(subdirs))
@@ -4,26 +4,49 @@ Fetch Wikipedia pages as PDF for bands in selected folders.
 """
 
 import os
+import re
+import shutil
 import sys
 import argparse
 import subprocess
+import threading
 import urllib.parse
-import urllib.request
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from utils.cache import CACHE_DIR, load_json_cache, save_json_cache
 
 console = Console()
 
 # User-Agent header required by Wikipedia
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
-def make_request(url, timeout=10):
-    """Make HTTP request with proper User-Agent header."""
-    request = urllib.request.Request(url)
-    request.add_header('User-Agent', USER_AGENT)
-    return urllib.request.urlopen(request, timeout=timeout)
+# Folders wait on Wikipedia round-trips rather than CPU, so many can be in flight
+DEFAULT_WORKERS = 16
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Trailing years "(1985)" / "(1982-2020)", tags like "[FLAC]" and "- Discography"; "(US)"-style
+# qualifiers stay, since they tell same-named bands apart
+BAND_SUFFIX_RE = re.compile(r'\s*(?:\([^()]*\d[^()]*\)|\[[^\[\]]*\])\s*$|\s*-\s*Discography\s*$', re.IGNORECASE)
+AUDIO_EXTS = frozenset({'.flac', '.mp3', '.m4a', '.ogg', '.wav'})
+# Resolved page title per band name, so re-runs skip the Wikipedia lookups
+TITLE_CACHE_PATH = os.path.join(CACHE_DIR, 'wiki_titles.json')
+title_cache = {}
+
+_local = threading.local()
+
+def get_session():
+    """This thread's requests session (created on first use), so lookups and downloads reuse keep-alive connections."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = USER_AGENT
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        _local.session = session
+    return session
 
 def select_folder_dialog():
     """Show macOS folder picker dialog and return selected path."""
@@ -45,18 +68,26 @@ def select_folder_dialog():
     except subprocess.CalledProcessError:
         return None
 
+@lru_cache(maxsize=4096)
 def search_wikipedia(query):
-    """Search Wikipedia for a page title matching the query."""
+    """Search Wikipedia for a page title matching the query, consulting the title cache first."""
+    title = title_cache.get(query)
+    if title is None:
+        title = lookup_wikipedia_title(query)
+        # Only hits are remembered across runs, so a page created later is still found
+        if title:
+            title_cache[query] = title
+    return title
+
+def lookup_wikipedia_title(query):
+    """Resolve a query to a page title: direct page lookup, then the search API."""
     # First, try direct page lookup (exact match)
     direct_url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + urllib.parse.quote(query.replace(' ', '_'))
     
     try:
-        with make_request(direct_url, timeout=10) as response:
-            if response.status == 200:
-                data = json.loads(response.read())
-                return data.get('title')
-    except urllib.error.HTTPError:
-        pass
+        response = get_session().get(direct_url, timeout=10)
+        if response.status_code == 200:
+            return response.json().get('title')
     except Exception:
         pass
     
@@ -64,11 +95,10 @@ def search_wikipedia(query):
     search_api_url = f"https://en.wikipedia.org/w/api.php?action=query&list=search&srsearch={urllib.parse.quote(query)}&format=json&srlimit=5"
     
     try:
-        with make_request(search_api_url, timeout=10) as response:
-            data = json.loads(response.read())
-            if 'query' in data and 'search' in data['query'] and len(data['query']['search']) > 0:
-                # Return the first (most relevant) result
-                return data['query']['search'][0]['title']
+        data = get_session().get(search_api_url, timeout=10).json()
+        if 'query' in data and 'search' in data['query'] and len(data['query']['search']) > 0:
+            # Return the first (most relevant) result
+            return data['query']['search'][0]['title']
     except Exception:
         pass
     
@@ -80,30 +110,42 @@ def download_wikipedia_pdf(page_title, output_path):
     pdf_url = f"https://en.wikipedia.org/api/rest_v1/page/pdf/{urllib.parse.quote(page_title.replace(' ', '_'))}"
     
     try:
-        with make_request(pdf_url, timeout=30) as response:
-            if response.status == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.read())
+        with get_session().get(pdf_url, timeout=30, stream=True) as response:
+            if response.status_code == 200:
+                # Stream to disk so a worker holds one chunk of the PDF in memory, not the whole file
+                response.raw.decode_content = True
+                try:
+                    with open(output_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                except Exception:
+                    # A truncated wiki.pdf would be skipped as already downloaded on the next run
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    raise
                 return True
+            elif response.status_code == 404:
+                console.print(f"[yellow]Page not found: {page_title}[/yellow]")
+            elif response.status_code >= 400:
+                console.print(f"[red]HTTP error {response.status_code}: {response.reason}[/red]")
             else:
-                console.print(f"[red]Failed to download PDF: HTTP {response.status}[/red]")
-                return False
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            console.print(f"[yellow]Page not found: {page_title}[/yellow]")
-        else:
-            console.print(f"[red]HTTP error {e.code}: {e.reason}[/red]")
-        return False
+                console.print(f"[red]Failed to download PDF: HTTP {response.status_code}[/red]")
+            return False
     except Exception as e:
         console.print(f"[red]Error downloading PDF: {e}[/red]")
         return False
 
+@lru_cache(maxsize=8192)
 def extract_band_name(folder_path):
     """Extract band name from folder path."""
     folder_name = os.path.basename(folder_path.rstrip('/'))
-    # Remove common suffixes that might not be part of the band name
-    # You can customize this based on your folder naming conventions
-    return folder_name
+    # Remove suffixes that aren't part of the band name, repeated so stacked ones all come off
+    band_name = folder_name
+    while True:
+        stripped = BAND_SUFFIX_RE.sub('', band_name)
+        if stripped == band_name:
+            break
+        band_name = stripped
+    return band_name or folder_name
 
 def process_folder(folder_path, dry_run=False, verbose=False):
     """Process a single folder - search Wikipedia and download PDF."""
@@ -140,7 +182,12 @@ def process_folder(folder_path, dry_run=False, verbose=False):
     else:
         return False
 
-def process_directory(root_path, dry_run=False, verbose=False, recursive=True):
+def has_audio_files(folder):
+    """True if the folder directly holds an audio file; stops at the first one found."""
+    with os.scandir(folder) as it:
+        return any(os.path.splitext(e.name)[1].lower() in AUDIO_EXTS for e in it if e.is_file())
+
+def process_directory(root_path, dry_run=False, verbose=False, recursive=True, workers=DEFAULT_WORKERS):
     """Process all band folders in a directory."""
     root_path = Path(root_path)
     
@@ -151,27 +198,18 @@ def process_directory(root_path, dry_run=False, verbose=False, recursive=True):
     folders_to_process = []
     
     # Check if root_path itself is a band folder (has audio files)
-    has_audio = any(f.suffix.lower() in ['.flac', '.mp3', '.m4a', '.ogg', '.wav'] 
-                    for f in root_path.iterdir() if f.is_file())
-    
-    if has_audio:
+    if has_audio_files(root_path):
         # This is a band folder, process it directly
         folders_to_process.append(root_path)
     else:
-        # This is a directory, find all band folders
+        with os.scandir(root_path) as it:
+            subfolders = [Path(e.path) for e in it if e.is_dir()]
         if recursive:
-            for folder in root_path.iterdir():
-                if folder.is_dir():
-                    # Check if folder contains audio files
-                    has_audio = any(f.suffix.lower() in ['.flac', '.mp3', '.m4a', '.ogg', '.wav'] 
-                                  for f in folder.iterdir() if f.is_file())
-                    if has_audio:
-                        folders_to_process.append(folder)
+            # This is a directory, find all band folders (folders containing audio files)
+            folders_to_process.extend(folder for folder in subfolders if has_audio_files(folder))
         else:
             # Only check immediate subdirectories
-            for folder in root_path.iterdir():
-                if folder.is_dir():
-                    folders_to_process.append(folder)
+            folders_to_process.extend(subfolders)
     
     if not folders_to_process:
         console.print(f"[yellow]No band folders found in: {root_path}[/yellow]")
@@ -183,6 +221,18 @@ def process_directory(root_path, dry_run=False, verbose=False, recursive=True):
     failed = 0
     skipped = 0
     
+    # Folders that already have their PDF are counted here and never queued for a worker
+    if not dry_run:
+        pending = []
+        for folder in folders_to_process:
+            if os.path.exists(os.path.join(folder, 'wiki.pdf')):
+                skipped += 1
+                if verbose:
+                    console.print(f"[dim]⏭️  Skipping {extract_band_name(str(folder))} - wiki.pdf already exists[/dim]")
+            else:
+                pending.append(folder)
+        folders_to_process = pending
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -190,16 +240,20 @@ def process_directory(root_path, dry_run=False, verbose=False, recursive=True):
     ) as progress:
         task = progress.add_task("Processing folders...", total=len(folders_to_process))
         
-        for folder in folders_to_process:
-            result = process_folder(str(folder), dry_run, verbose)
-            if result is True:
-                successful += 1
-            elif result is False:
-                if os.path.exists(os.path.join(folder, 'wiki.pdf')):
-                    skipped += 1
-                else:
-                    failed += 1
-            progress.update(task, advance=1)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(process_folder, str(folder), dry_run, verbose): folder
+                       for folder in folders_to_process}
+            for future in as_completed(futures):
+                folder = futures[future]
+                result = future.result()
+                if result is True:
+                    successful += 1
+                elif result is False:
+                    if os.path.exists(os.path.join(folder, 'wiki.pdf')):
+                        skipped += 1
+                    else:
+                        failed += 1
+                progress.update(task, advance=1)
     
     console.print("\n[bold underline]Summary[/bold underline]")
     console.print(f"Successful: {successful}")
@@ -230,6 +284,17 @@ if __name__ == "__main__":
         action="store_true",
         help="Only process immediate subdirectories (not recursive)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Folders to process concurrently (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and don't update the page title cache (in {CACHE_DIR})"
+    )
     
     args = parser.parse_args()
     
@@ -243,10 +308,17 @@ if __name__ == "__main__":
             console.print("[red]No folder selected. Exiting.[/red]")
             sys.exit(1)
     
+    if not args.no_cache:
+        title_cache.update(load_json_cache(TITLE_CACHE_PATH))
+    
     process_directory(
         directory,
         dry_run=args.dry_run,
         verbose=args.verbose,
-        recursive=not args.no_recursive
+        recursive=not args.no_recursive,
+        workers=args.workers
     )
+    
+    if not args.no_cache:
+        save_json_cache(title_cache, TITLE_CACHE_PATH)
 